@@ -0,0 +1,344 @@
+import aiodocker
+from container_common import KAFKA_API_VERSIONS_COMMAND, KAFKA_ERR, KAFKA_OK, KAFKA_READY_PATTERN, KAFKA_TOPICS_COMMAND
+from typing import Optional, Dict, List
+import asyncio
+import re
+import shlex
+import time
+import logging
+
+# Настраиваем логирование, используя тот же формат
+logger = logging.getLogger("async_container_operations")
+
+
+class AsyncContainerOperations:
+    """
+    Асинхронный вариант ContainerOperations поверх aiodocker
+
+    Все ожидания (логи, проверки готовности) выполняются в одном event loop,
+    поэтому одновременное ожидание множества контейнеров не требует потока на контейнер.
+    """
+
+    def __init__(self):
+        try:
+            self.docker = aiodocker.Docker()
+            self.containers: Dict[str, "aiodocker.containers.DockerContainer"] = {}
+            logger.info("Асинхронный Docker клиент инициализирован успешно")
+        except Exception as e:
+            logger.error("Ошибка при инициализации асинхронного Docker клиента: %s", e)
+            raise
+
+    async def __aenter__(self) -> "AsyncContainerOperations":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.cleanup()
+
+    async def start_container(
+        self,
+        name: str,
+        image: str,
+        environment: Optional[Dict[str, str]] = None,
+        ports: Optional[Dict[int, int]] = None,
+        command: Optional[str] = None,
+        network_mode: str = "bridge",
+        volumes: Optional[Dict[str, str]] = None,
+        pull_image: bool = False,
+    ) -> Optional["aiodocker.containers.DockerContainer"]:
+        """
+        Запускает контейнер с заданными параметрами
+
+        Args:
+            name: Имя контейнера
+            image: Docker image
+            environment: Переменные окружения
+            ports: Маппинг портов {container_port: host_port}
+            command: Команда для запуска
+            network_mode: Режим сети (bridge, host, etc.)
+            volumes: Маппинг томов {host_path: container_path}
+            pull_image: Нужно ли подтягивать образ перед запуском
+        """
+        try:
+            logger.info("Запуск контейнера %s (образ: %s)", name, image)
+
+            # Проверяем, не запущен ли уже контейнер с таким именем
+            if name in self.containers:
+                logger.warning("Контейнер с именем %s уже запущен, останавливаем его", name)
+                await self.stop_container(name)
+
+            if pull_image:
+                logger.info("Подтягиваем образ %s", image)
+                try:
+                    await self.docker.images.pull(image)
+                except Exception as e:
+                    logger.warning("Не удалось подтянуть образ %s: %s", image, e)
+
+            config = {
+                "Image": image,
+                "Env": [f"{key}={value}" for key, value in (environment or {}).items()],
+                "ExposedPorts": {f"{container_port}/tcp": {} for container_port in (ports or {})},
+                "HostConfig": {
+                    "NetworkMode": network_mode,
+                    "PortBindings": {
+                        f"{container_port}/tcp": [{"HostPort": str(host_port)}]
+                        for container_port, host_port in (ports or {}).items()
+                    },
+                    # Тот же режим, что и у ContainerOperations (только для чтения)
+                    "Binds": [
+                        f"{host_path}:{container_path}:ro" for host_path, container_path in (volumes or {}).items()
+                    ],
+                },
+            }
+            if command:
+                config["Cmd"] = shlex.split(command)
+
+            # run() создает и запускает контейнер, подтягивая образ при его отсутствии
+            container = await self.docker.containers.run(config, name=name)
+            self.containers[name] = container
+
+            logger.info("Контейнер %s успешно запущен", name)
+            return container
+
+        except Exception as e:
+            logger.error("Ошибка при запуске контейнера %s: %s", name, e)
+            return None
+
+    async def start_containers(self, specs: List[dict]) -> Dict[str, Optional["aiodocker.containers.DockerContainer"]]:
+        """
+        Запускает несколько контейнеров конкурентно
+
+        Args:
+            specs: Список параметров контейнеров (аргументы start_container)
+
+        Returns:
+            dict: {имя контейнера: контейнер или None в случае ошибки}
+        """
+        results = await asyncio.gather(*(self.start_container(**spec) for spec in specs))
+        return {spec["name"]: container for spec, container in zip(specs, results)}
+
+    async def stop_container(self, name: str) -> bool:
+        """
+        Останавливает контейнер по имени
+        """
+        try:
+            container = self.containers.pop(name, None)
+            if container is None:
+                logger.warning("Контейнер %s не найден", name)
+                return False
+
+            logger.info("Останавливаем контейнер %s", name)
+            await container.delete(force=True, v=True)
+            logger.info("Контейнер %s остановлен", name)
+            return True
+        except Exception as e:
+            logger.error("Ошибка при остановке контейнера %s: %s", name, e)
+            return False
+
+    async def wait_for_container_log(self, name: str, message: str, timeout: float = 30) -> bool:
+        """
+        Ожидает появления сообщения в логах контейнера, читая поток логов
+
+        Args:
+            name: Имя контейнера
+            message: Регулярное выражение для поиска
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            bool: True если сообщение найдено, False в случае ошибки или таймаута
+        """
+        try:
+            container = self.containers.get(name)
+            if container is None:
+                logger.warning("Контейнер %s не найден для ожидания лога", name)
+                return False
+
+            logger.info(
+                "Ожидание появления сообщения '%s' в логах контейнера %s, таймаут %s сек", message, name, timeout
+            )
+            # MULTILINE, как в синхронной версии: ^ и $ срабатывают на границах строк
+            regex = re.compile(message, re.MULTILINE)
+
+            async def _scan() -> bool:
+                async for line in container.log(stdout=True, stderr=True, follow=True):
+                    if regex.search(line):
+                        return True
+                return False
+
+            if await asyncio.wait_for(_scan(), timeout=timeout):
+                logger.info("Сообщение '%s' найдено в логах контейнера %s", message, name)
+                return True
+
+            logger.warning("Поток логов контейнера %s завершился без сообщения '%s'", name, message)
+            return False
+        except asyncio.TimeoutError:
+            logger.warning("Сообщение '%s' не найдено в логах контейнера %s за %s сек", message, name, timeout)
+            return False
+        except Exception as e:
+            logger.error("Ошибка при ожидании лога в контейнере %s: %s", name, e)
+            return False
+
+    async def get_container_logs(self, name: str, tail: int = 100) -> Optional[str]:
+        """
+        Получает логи контейнера
+
+        Args:
+            name: Имя контейнера
+            tail: Количество последних строк для возврата
+
+        Returns:
+            str: Логи контейнера или None в случае ошибки
+        """
+        try:
+            container = self.containers.get(name)
+            if container is None:
+                logger.warning("Контейнер %s не найден для получения логов", name)
+                return None
+
+            logger.debug("Получение логов контейнера %s", name)
+            lines = await container.log(stdout=True, stderr=True, tail=tail if tail > 0 else "all")
+            return "".join(lines)
+        except Exception as e:
+            logger.error("Ошибка при получении логов контейнера %s: %s", name, e)
+            return None
+
+    async def get_container_status(self, name: str) -> Optional[str]:
+        """
+        Получает статус контейнера
+
+        Args:
+            name: Имя контейнера
+
+        Returns:
+            str: Статус контейнера или None в случае ошибки
+        """
+        try:
+            container = self.containers.get(name)
+            if container is None:
+                logger.warning("Контейнер %s не найден для получения статуса", name)
+                return None
+
+            info = await container.show()
+            status = info["State"]["Status"]
+            logger.debug("Статус контейнера %s: %s", name, status)
+            return status
+        except Exception as e:
+            logger.error("Ошибка при получении статуса контейнера %s: %s", name, e)
+            return None
+
+    async def exec_in_container(self, name: str, command: List[str]) -> Optional[str]:
+        """
+        Выполняет команду в контейнере
+
+        Args:
+            name: Имя контейнера
+            command: Команда для выполнения в виде списка
+
+        Returns:
+            str: Результат выполнения команды или None в случае ошибки
+        """
+        output = await self.exec_in_container_bytes(name, command)
+        if output is None:
+            return None
+        return output.decode("utf-8")
+
+    async def exec_in_container_bytes(self, name: str, command: List[str]) -> Optional[bytes]:
+        """
+        Выполняет команду в контейнере и возвращает вывод без декодирования
+
+        Args:
+            name: Имя контейнера
+            command: Команда для выполнения в виде списка
+
+        Returns:
+            bytes: Результат выполнения команды или None в случае ошибки
+        """
+        try:
+            container = self.containers.get(name)
+            if container is None:
+                logger.warning("Контейнер %s не найден для выполнения команды", name)
+                return None
+
+            logger.info("Выполнение команды %s в контейнере %s", command, name)
+            exec_instance = await container.exec(command, stdout=True, stderr=True)
+            chunks = []
+            async with exec_instance.start(detach=False) as stream:
+                while True:
+                    message = await stream.read_out()
+                    if message is None:
+                        break
+                    chunks.append(message.data)
+            return b"".join(chunks)
+        except Exception as e:
+            logger.error("Ошибка при выполнении команды в контейнере %s: %s", name, e)
+            return None
+
+    async def wait_for_kafka_ready(self, container_name: str, timeout: int = 120) -> bool:
+        """
+        Ожидает готовности Kafka в контейнере
+
+        Args:
+            container_name: Имя контейнера с Kafka
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            bool: True если Kafka готова, False в случае ошибки или таймаута
+        """
+        # Общий дедлайн для всех способов проверки, чтобы не превышать таймаут вызывающего кода
+        deadline = time.monotonic() + timeout
+        try:
+            logger.info("Ожидание готовности Kafka в контейнере %s, таймаут %s сек", container_name, timeout)
+
+            # Проверяем существование контейнера
+            if container_name not in self.containers:
+                logger.error("Контейнер %s не найден", container_name)
+                return False
+
+            # Способ 1: Ожидание характерного сообщения в логах (~30% бюджета времени, не более 30 сек)
+            log_timeout = min(30, timeout * 0.3)
+            if await self.wait_for_container_log(container_name, KAFKA_READY_PATTERN, timeout=log_timeout):
+                logger.info("Kafka в контейнере %s готова (по логам)", container_name)
+                return True
+
+            # Способ 2: Конкурентная проверка с помощью kafka-topics и kafka-broker-api-versions
+            delay = 0.2
+            while time.monotonic() < deadline:
+                topics_ready, api_ready = await asyncio.gather(
+                    self._probe_kafka_topics(container_name), self._probe_kafka_api_versions(container_name)
+                )
+                if topics_ready or api_ready:
+                    description = "по проверке команды" if topics_ready else "по проверке API версий"
+                    logger.info("Kafka в контейнере %s готова (%s)", container_name, description)
+                    return True
+
+                # Ждем перед следующей попыткой с экспоненциальной задержкой, не выходя за дедлайн
+                await asyncio.sleep(max(0, min(delay, deadline - time.monotonic())))
+                delay = min(delay * 1.5, 2.0)
+
+            logger.warning("Таймаут ожидания готовности Kafka в контейнере %s (%s сек)", container_name, timeout)
+            return False
+        except Exception as e:
+            logger.error("Ошибка при ожидании готовности Kafka в контейнере %s: %s", container_name, e)
+            return False
+
+    async def _probe_kafka_topics(self, container_name: str) -> bool:
+        """
+        Проверяет работоспособность Kafka с помощью команды kafka-topics
+        """
+        result = await self.exec_in_container_bytes(container_name, KAFKA_TOPICS_COMMAND)
+        return result is not None and result.find(KAFKA_ERR) == -1
+
+    async def _probe_kafka_api_versions(self, container_name: str) -> bool:
+        """
+        Проверяет работоспособность Kafka с помощью команды kafka-broker-api-versions
+        """
+        result = await self.exec_in_container_bytes(container_name, KAFKA_API_VERSIONS_COMMAND)
+        return result is not None and result.find(KAFKA_OK) != -1
+
+    async def cleanup(self):
+        """
+        Останавливает все запущенные контейнеры и закрывает Docker клиент
+        """
+        names = list(self.containers.keys())
+        logger.info("Очистка всех контейнеров (%s шт.)", len(names))
+        await asyncio.gather(*(self.stop_container(name) for name in names))
+        await self.docker.close()
@@ -0,0 +1,663 @@
+from kubernetes_asyncio import client, config, watch
+from kubernetes_asyncio.stream import WsApiClient
+from k8s_common import (
+    KAFKA_PROBE_COMMAND,
+    KAFKA_READY_TAGS,
+    NODEPORT_SERVICE_TEMPLATE,
+    RESOURCE_READERS,
+    format_label_selector,
+    is_pod_ready,
+    load_yaml,
+    load_yaml_all,
+    manifest_version,
+    normalize_selector,
+)
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger("async_k8s_operations")
+
+
+class AsyncKubernetesOperations:
+    """
+    Асинхронный вариант KubernetesOperations поверх kubernetes_asyncio
+
+    Экземпляр создается через `await AsyncKubernetesOperations.create()`, так как
+    загрузка конфигурации в kubernetes_asyncio асинхронная. Вызовы API не блокируют
+    поток, поэтому множество операций можно выполнять конкурентно в одном event loop.
+    """
+
+    # Имя владельца полей при server-side apply
+    _FIELD_MANAGER = "k8s-remote"
+    # Интервал keep-alive ping для WebSocket-соединений, сек
+    _WS_HEARTBEAT = 30.0
+    # Время жизни закэшированного результата проверки существования ресурса, сек
+    _EXISTS_TTL = 5.0
+    # Время жизни закэшированного имени пода, найденного по метке, сек
+    _POD_NAME_TTL = 10.0
+
+    def __init__(self, configuration: client.Configuration):
+        self.configuration = configuration
+        # Обычный клиент для REST-запросов и отдельный WebSocket-клиент для exec
+        self.api_client = client.ApiClient(configuration=configuration)
+        # WebSocket ping каждые _WS_HEARTBEAT сек: длительные exec-сессии не закрываются по простою
+        self.ws_api_client = WsApiClient(configuration=configuration, heartbeat=self._WS_HEARTBEAT)
+        self.v1 = client.CoreV1Api(self.api_client)
+        self.apps_v1 = client.AppsV1Api(self.api_client)
+        # Связанные методы чтения строятся один раз, а не через getattr на каждую проверку
+        self._readers = {
+            resource_type: getattr(getattr(self, attr), method)
+            for resource_type, (attr, method) in RESOURCE_READERS.items()
+        }
+        self._ws_v1 = client.CoreV1Api(self.ws_api_client)
+        # (тип ресурса, namespace, имя) -> (существует ли, время проверки)
+        self._exists_cache: Dict[Tuple[str, str, str], Tuple[bool, float]] = {}
+        # (namespace, нормализованный селектор меток) -> (имя запущенного пода, время поиска)
+        self._pod_name_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
+    @classmethod
+    async def create(cls, context=None) -> "AsyncKubernetesOperations":
+        """
+        Загружает конфигурацию из файла ~/.kube/config и создает экземпляр
+        """
+        try:
+            configuration = client.Configuration()
+            await config.load_kube_config(context=context, client_configuration=configuration)
+            operations = cls(configuration)
+            logger.info("Асинхронный Kubernetes клиент инициализирован успешно")
+            return operations
+        except Exception as e:
+            logger.error("Ошибка при инициализации асинхронного Kubernetes клиента: %s", e)
+            raise
+
+    async def __aenter__(self) -> "AsyncKubernetesOperations":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Закрывает HTTP-сессии клиентов
+        """
+        await self.ws_api_client.close()
+        await self.api_client.close()
+
+    async def resource_exists(self, name: str, namespace: str = "default", resource_type: str = "deployment") -> bool:
+        """
+        Проверяет существование ресурса в кластере
+
+        Args:
+            name: Имя ресурса
+            namespace: Namespace ресурса
+            resource_type: Тип ресурса ('deployment', 'service', 'pod')
+
+        Returns:
+            bool: True если ресурс существует, False если нет
+        """
+        reader = self._readers.get(resource_type)
+        if reader is None:
+            logger.warning("Неизвестный тип ресурса: %s", resource_type)
+            return False
+
+        # Повторные проверки в пределах _EXISTS_TTL не обращаются к API-серверу
+        key = (resource_type, namespace, name)
+        cached = self._exists_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self._EXISTS_TTL:
+            return cached[0]
+
+        try:
+            await reader(name, namespace)
+            self._exists_cache[key] = (True, time.monotonic())
+            return True
+        except client.exceptions.ApiException as e:
+            if e.status == 404:
+                self._exists_cache[key] = (False, time.monotonic())
+                return False
+            logger.error("API ошибка при проверке ресурса %s/%s: %s", resource_type, name, e)
+            raise e
+        except Exception as e:
+            logger.error("Ошибка при проверке ресурса %s/%s: %s", resource_type, name, e)
+            return False
+
+    def _remember_resource(self, name: str, namespace: str, resource_type: str, exists: bool):
+        """
+        Запоминает состояние ресурса после его изменения, чтобы следующая проверка не обращалась к API-серверу
+        """
+        self._exists_cache[(resource_type, namespace, name)] = (exists, time.monotonic())
+
+    async def create_deployment(self, yaml_file, wait_ready=False, timeout=60):
+        """
+        Создает deployment из yaml файла
+
+        Args:
+            yaml_file: Путь к YAML файлу
+            wait_ready: Ожидать ли готовности подов
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            Объект Deployment или None в случае ошибки
+        """
+        try:
+            dep = load_yaml(yaml_file, manifest_version(yaml_file))
+        except Exception as e:
+            logger.error("Ошибка при чтении файла %s: %s", yaml_file, e)
+            return None
+        return await self._apply_deployment(dep, wait_ready, timeout)
+
+    async def _apply_deployment(self, dep: dict, wait_ready=False, timeout=60):
+        """
+        Создает или обновляет deployment по разобранному манифесту
+        """
+        try:
+            name = dep["metadata"]["name"]
+            namespace = dep["metadata"].get("namespace", "default")
+
+            logger.info("Применяем deployment %s...", name)
+            resp = await self._server_side_apply(self.apps_v1.patch_namespaced_deployment, name, namespace, dep)
+
+            self._remember_resource(name, namespace, "deployment", True)
+            logger.info("Deployment %s создан/обновлен", resp.metadata.name)
+
+            if wait_ready and "spec" in dep and "selector" in dep["spec"] and "matchLabels" in dep["spec"]["selector"]:
+                labels = dep["spec"]["selector"]["matchLabels"]
+                label_selector = format_label_selector(frozenset(labels.items()))
+                if await self.wait_for_pod_ready(label_selector, namespace, timeout, dep["spec"].get("replicas", 1)):
+                    logger.info("Поды deployment %s готовы", name)
+                else:
+                    logger.warning("Таймаут ожидания готовности подов deployment %s", name)
+
+            return resp
+        except Exception as e:
+            logger.error("Ошибка при создании deployment %s: %s", dep.get("metadata", {}).get("name"), e)
+            return None
+
+    async def create_service(self, yaml_file):
+        """
+        Создает service из yaml файла
+        """
+        try:
+            svc = load_yaml(yaml_file, manifest_version(yaml_file))
+        except Exception as e:
+            logger.error("Ошибка при чтении файла %s: %s", yaml_file, e)
+            return None
+        return await self._apply_service(svc)
+
+    async def _apply_service(self, svc: dict):
+        """
+        Создает или обновляет service по разобранному манифесту
+        """
+        try:
+            name = svc["metadata"]["name"]
+            namespace = svc["metadata"].get("namespace", "default")
+
+            logger.info("Применяем service %s...", name)
+            resp = await self._server_side_apply(self.v1.patch_namespaced_service, name, namespace, svc)
+
+            self._remember_resource(name, namespace, "service", True)
+            logger.info("Service %s создан/обновлен", resp.metadata.name)
+            return resp
+        except Exception as e:
+            logger.error("Ошибка при создании service %s: %s", svc.get("metadata", {}).get("name"), e)
+            return None
+
+    async def _server_side_apply(self, patch_method, name: str, namespace: str, body: dict):
+        """
+        Создает или обновляет ресурс одним PATCH-запросом (server-side apply) без предварительного чтения
+
+        При конфликте владения полями (409) запрос повторяется с force=True.
+        """
+        try:
+            return await patch_method(
+                name,
+                namespace,
+                body,
+                field_manager=self._FIELD_MANAGER,
+                _content_type="application/apply-patch+yaml",
+            )
+        except client.exceptions.ApiException as e:
+            if e.status != 409:
+                raise
+            logger.warning("Конфликт владения полями %s, повторяем apply с force", name)
+            return await patch_method(
+                name,
+                namespace,
+                body,
+                field_manager=self._FIELD_MANAGER,
+                force=True,
+                _content_type="application/apply-patch+yaml",
+            )
+
+    async def apply_manifests(
+        self, yaml_files: List[str], concurrency: int = 16, wait_ready: bool = False, timeout: float = 60
+    ) -> list:
+        """
+        Конкурентно создает или обновляет ресурсы из нескольких yaml файлов
+
+        Все файлы (включая многодокументные, с разделителем ---) разбираются заранее,
+        затем запросы к API-серверу выполняются одновременно, но не более concurrency за раз.
+        При wait_ready ожидание готовности подов разных deployment тоже идет одновременно,
+        поэтому общее время определяется самым медленным deployment, а не суммой ожиданий.
+
+        Args:
+            yaml_files: Пути к YAML файлам
+            concurrency: Максимальное число одновременных запросов (включая watch-потоки ожидания)
+            wait_ready: Ожидать ли готовности подов каждого deployment
+            timeout: Таймаут ожидания готовности в секундах
+
+        Returns:
+            list: Результаты по каждому документу в порядке файлов (None в случае ошибки)
+        """
+        documents = []
+        for yaml_file in yaml_files:
+            try:
+                documents.extend(load_yaml_all(yaml_file, manifest_version(yaml_file)))
+            except Exception as e:
+                logger.error("Ошибка при чтении файла %s: %s", yaml_file, e)
+
+        logger.info("Конкурентное применение %s манифестов из %s файлов", len(documents), len(yaml_files))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _apply(document: dict):
+            async with semaphore:
+                kind = document.get("kind")
+                if kind == "Deployment":
+                    return await self._apply_deployment(document, wait_ready, timeout)
+                if kind == "Service":
+                    return await self._apply_service(document)
+                logger.warning("Неподдерживаемый тип ресурса %s", kind)
+                return None
+
+        return list(await asyncio.gather(*(_apply(document) for document in documents)))
+
+    async def delete_deployment(self, name, namespace="default", wait: bool = False):
+        """
+        Удаляет deployment по имени
+
+        Args:
+            name: Имя deployment
+            namespace: Namespace deployment
+            wait: Удалять с Foreground-распространением (deployment удаляется после зависимых подов).
+                По умолчанию используется Background: зависимые ресурсы удаляет сборщик мусора кластера
+
+        Returns:
+            Ответ API, True если deployment не существует, или None в случае ошибки
+        """
+        try:
+            # Удаляем сразу, без предварительной проверки существования: 404 означает, что удалять нечего
+            resp = await self.apps_v1.delete_namespaced_deployment(
+                name=name,
+                namespace=namespace,
+                body=(
+                    client.V1DeleteOptions(propagation_policy="Foreground", grace_period_seconds=5)
+                    if wait
+                    else client.V1DeleteOptions(propagation_policy="Background", grace_period_seconds=0)
+                ),
+            )
+            self._remember_resource(name, namespace, "deployment", False)
+            self._pod_name_cache.clear()
+            logger.info("Deployment %s удален", name)
+            return resp
+        except client.exceptions.ApiException as e:
+            if e.status == 404:
+                self._remember_resource(name, namespace, "deployment", False)
+                logger.info("Deployment %s не существует, пропускаем удаление", name)
+                return True
+            logger.error("Ошибка при удалении deployment %s: %s", name, e)
+            return None
+        except Exception as e:
+            logger.error("Ошибка при удалении deployment %s: %s", name, e)
+            return None
+
+    async def delete_service(self, name, namespace="default"):
+        """
+        Удаляет service по имени
+        """
+        try:
+            resp = await self.v1.delete_namespaced_service(name=name, namespace=namespace)
+            self._remember_resource(name, namespace, "service", False)
+            self._pod_name_cache.clear()
+            logger.info("Service %s удален", name)
+            return resp
+        except client.exceptions.ApiException as e:
+            if e.status == 404:
+                self._remember_resource(name, namespace, "service", False)
+                logger.info("Service %s не существует, пропускаем удаление", name)
+                return True
+            logger.error("Ошибка при удалении service %s: %s", name, e)
+            return None
+        except Exception as e:
+            logger.error("Ошибка при удалении service %s: %s", name, e)
+            return None
+
+    async def exec_command_in_pod(self, pod_name, namespace="default", command=None, timeout=30):
+        """
+        Выполняет команду внутри pod
+
+        Args:
+            pod_name: Имя пода
+            namespace: Namespace пода
+            command: Команда для выполнения в виде списка
+            timeout: Таймаут выполнения команды в секундах
+
+        Returns:
+            str: Результат выполнения команды или None в случае ошибки
+        """
+        if command is None:
+            command = ["/bin/sh"]
+
+        try:
+            logger.info("Выполняем команду %s в поде %s", command, pod_name)
+            # WsApiClient не применяет _request_timeout к WebSocket-соединению, поэтому ограничиваем вызов целиком
+            return await asyncio.wait_for(
+                self._ws_v1.connect_get_namespaced_pod_exec(
+                    pod_name,
+                    namespace,
+                    command=command,
+                    stderr=True,
+                    stdin=False,
+                    stdout=True,
+                    tty=False,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Команда %s в поде %s не завершилась за %s сек", command, pod_name, timeout)
+            return None
+        except Exception as e:
+            logger.error("Ошибка при выполнении команды в pod %s: %s", pod_name, e)
+            return None
+
+    async def expose_service_nodeport(
+        self, service_name, selector=None, namespace="default", port=80, target_port=80, node_port=30000
+    ):
+        """
+        Создает NodePort service для доступа к приложению извне кластера
+
+        Args:
+            service_name: Имя сервиса
+            selector: Селектор для выбора подов (dict)
+            namespace: Namespace сервиса
+            port: Порт сервиса
+            target_port: Целевой порт в поде
+            node_port: Порт на ноде
+
+        Returns:
+            Объект Service или None в случае ошибки
+        """
+        try:
+            if selector is None:
+                selector = {"app": service_name}
+
+            service_manifest = dict(
+                NODEPORT_SERVICE_TEMPLATE,
+                metadata={"name": service_name},
+                spec={
+                    "type": "NodePort",
+                    "ports": [{"port": port, "targetPort": target_port, "nodePort": node_port}],
+                    "selector": selector,
+                },
+            )
+
+            logger.info("Создаем NodePort service %s на порту %s", service_name, node_port)
+            # Сразу пробуем создать сервис; если он уже существует (409), обновляем его одним запросом
+            try:
+                resp = await self.v1.create_namespaced_service(namespace=namespace, body=service_manifest)
+            except client.exceptions.ApiException as e:
+                if e.status != 409:
+                    raise
+                logger.info("Service %s уже существует, обновляем...", service_name)
+                resp = await self.v1.replace_namespaced_service(
+                    name=service_name, namespace=namespace, body=service_manifest
+                )
+            self._remember_resource(service_name, namespace, "service", True)
+            logger.info("NodePort Service %s создан на порту %s", service_name, node_port)
+            return resp
+        except Exception as e:
+            logger.error("Ошибка при создании NodePort service %s: %s", service_name, e)
+            return None
+
+    async def get_pod_name_by_label(self, label_selector: str, namespace: str = "default") -> str:
+        """
+        Получает имя пода по метке
+
+        Args:
+            label_selector: Селектор меток (например, "app=kafka-ui")
+            namespace: Namespace пода
+
+        Returns:
+            str: Имя пода или None, если под не найден
+        """
+        try:
+            # Повторные поиски по той же метке в пределах _POD_NAME_TTL не обращаются к API-серверу
+            cache_key = (namespace, normalize_selector(label_selector))
+            cached = self._pod_name_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[1] < self._POD_NAME_TTL:
+                return cached[0]
+
+            logger.info("Поиск пода по метке %s в namespace %s", label_selector, namespace)
+            pods = await self.v1.list_namespaced_pod(
+                namespace=namespace,
+                label_selector=label_selector,
+                field_selector="status.phase=Running",
+                limit=1,
+                _request_timeout=5,
+            )
+            if pods.items:
+                logger.info("Найден запущенный под %s", pods.items[0].metadata.name)
+                self._pod_name_cache[cache_key] = (pods.items[0].metadata.name, time.monotonic())
+                return pods.items[0].metadata.name
+
+            pods = await self.v1.list_namespaced_pod(
+                namespace=namespace, label_selector=label_selector, limit=1, _request_timeout=5
+            )
+            if pods.items:
+                logger.warning(
+                    "Запущенные поды не найдены, используем первый доступный: %s", pods.items[0].metadata.name
+                )
+                return pods.items[0].metadata.name
+
+            logger.warning("Под с меткой %s не найден", label_selector)
+            return None
+        except Exception as e:
+            logger.error("Ошибка при поиске пода по метке %s: %s", label_selector, e)
+            return None
+
+    async def list_pods(self, label_selector: str, namespaces: Optional[List[str]] = None) -> list:
+        """
+        Получает поды по метке сразу во всех нужных namespace одним запросом
+
+        Args:
+            label_selector: Селектор меток (например, "app=kafka")
+            namespaces: Namespace, в которых искать поды (по умолчанию все)
+
+        Returns:
+            list: Объекты Pod или None в случае ошибки
+        """
+        try:
+            if namespaces is not None and len(namespaces) == 1:
+                pods = await self.v1.list_namespaced_pod(namespace=namespaces[0], label_selector=label_selector)
+                return pods.items
+
+            pods = (await self.v1.list_pod_for_all_namespaces(label_selector=label_selector)).items
+            if namespaces is None:
+                return pods
+            wanted = set(namespaces)
+            return [pod for pod in pods if pod.metadata.namespace in wanted]
+        except Exception as e:
+            logger.error("Ошибка при получении списка подов по метке %s: %s", label_selector, e)
+            return None
+
+    async def wait_for_pod_ready(
+        self, label_selector: str, namespace: str = "default", timeout: int = 60, expected_pods: Optional[int] = None
+    ) -> bool:
+        """
+        Ожидает готовности всех подов с меткой по событиям Watch API
+
+        Args:
+            label_selector: Селектор меток (например, "app=kafka-ui")
+            namespace: Namespace пода
+            timeout: Таймаут в секундах
+            expected_pods: Ожидаемое число подов (например, spec.replicas deployment); если не указано,
+                достаточно готовности всех уже появившихся подов
+
+        Returns:
+            bool: True если поды готовы, False в случае ошибки или таймаута
+        """
+        try:
+            logger.info("Ожидание готовности пода с меткой %s, таймаут %s сек", label_selector, timeout)
+            deadline = time.monotonic() + timeout
+            resource_version = None
+            # Наблюдаемые и готовые поды по uid (имя может повториться у пересозданного пода);
+            # множества позволяют пересчитывать готовность за O(1) на событие
+            pods_seen = set()
+            pods_ready = set()
+            required_pods = expected_pods or 1
+            # Последнее залогированное состояние (готово, всего): прогресс пишется в лог только при его изменении
+            last_logged = None
+
+            while time.monotonic() < deadline:
+                try:
+                    # Событие содержит под в виде словаря: полная модель V1Pod со спецификацией не строится
+                    async with watch.Watch(return_type="object") as w:
+                        async for event in w.stream(
+                            self.v1.list_namespaced_pod,
+                            namespace=namespace,
+                            label_selector=label_selector,
+                            resource_version=resource_version,
+                            timeout_seconds=max(1, int(deadline - time.monotonic())),
+                        ):
+                            pod = event["object"]
+                            resource_version = pod["metadata"]["resourceVersion"]
+
+                            if event["type"] == "DELETED":
+                                pods_seen.discard(pod["metadata"]["uid"])
+                                pods_ready.discard(pod["metadata"]["uid"])
+                                continue
+                            pods_seen.add(pod["metadata"]["uid"])
+                            if is_pod_ready(pod):
+                                pods_ready.add(pod["metadata"]["uid"])
+                            else:
+                                pods_ready.discard(pod["metadata"]["uid"])
+
+                            ready_pods = len(pods_ready)
+                            total_pods = len(pods_seen)
+                            if (ready_pods, total_pods) != last_logged:
+                                last_logged = (ready_pods, total_pods)
+                                logger.info("Готово %s/%s подов", ready_pods, total_pods)
+
+                            if ready_pods == total_pods and total_pods >= required_pods:
+                                logger.info("Все поды готовы (%s)", total_pods)
+                                return True
+                except client.exceptions.ApiException as e:
+                    # 410 Gone: версия ресурсов устарела, перезапускаем watch с полного списка
+                    if e.status != 410:
+                        raise
+                    logger.warning("Версия ресурсов устарела, перезапускаем watch подов")
+                    resource_version = None
+                    pods_seen.clear()
+                    pods_ready.clear()
+
+            logger.warning("Таймаут ожидания готовности пода (%s сек)", timeout)
+            return False
+        except Exception as e:
+            logger.error("Ошибка при ожидании готовности пода с меткой %s: %s", label_selector, e)
+            return False
+
+    async def _wait_and_get_ready_pod(self, label_selector: str, namespace: str = "default", timeout: int = 60):
+        """
+        Ожидает первый готовый под по метке и возвращает его имя (None в случае ошибки или таймаута)
+        """
+        try:
+            logger.info("Ожидание готового пода с меткой %s, таймаут %s сек", label_selector, timeout)
+            deadline = time.monotonic() + timeout
+            resource_version = None
+
+            while time.monotonic() < deadline:
+                try:
+                    # Событие содержит под в виде словаря: полная модель V1Pod со спецификацией не строится
+                    async with watch.Watch(return_type="object") as w:
+                        async for event in w.stream(
+                            self.v1.list_namespaced_pod,
+                            namespace=namespace,
+                            label_selector=label_selector,
+                            resource_version=resource_version,
+                            timeout_seconds=max(1, int(deadline - time.monotonic())),
+                        ):
+                            pod = event["object"]
+                            resource_version = pod["metadata"]["resourceVersion"]
+
+                            if event["type"] != "DELETED" and is_pod_ready(pod):
+                                logger.info("Найден готовый под %s", pod["metadata"]["name"])
+                                return pod["metadata"]["name"]
+                except client.exceptions.ApiException as e:
+                    if e.status != 410:
+                        raise
+                    logger.warning("Версия ресурсов устарела, перезапускаем watch подов")
+                    resource_version = None
+
+            logger.warning("Готовый под с меткой %s не найден за %s сек", label_selector, timeout)
+            return None
+        except Exception as e:
+            logger.error("Ошибка при ожидании пода по метке %s: %s", label_selector, e)
+            return None
+
+    async def wait_for_kafka_ready(self, pod_name=None, label_selector=None, namespace="default", timeout=120):
+        """
+        Ожидает готовности Kafka в поде Kubernetes
+
+        Args:
+            pod_name: Имя пода с Kafka (если не указано, будет использован label_selector)
+            label_selector: Селектор меток для поиска пода (например, "app=kafka")
+            namespace: Namespace пода
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            bool: True если Kafka готова, False в случае ошибки или таймаута
+        """
+        deadline = time.monotonic() + timeout
+        try:
+            if pod_name is None and label_selector is not None:
+                logger.info("Поиск пода Kafka по метке %s", label_selector)
+                pod_name = await self._wait_and_get_ready_pod(
+                    label_selector, namespace, max(0, deadline - time.monotonic())
+                )
+                if pod_name is None:
+                    logger.error("Не удалось найти под Kafka по метке %s", label_selector)
+                    return False
+            elif pod_name is None:
+                logger.error("Необходимо указать pod_name или label_selector")
+                return False
+            elif not await self.resource_exists(pod_name, namespace, "pod"):
+                logger.error("Под %s не существует", pod_name)
+                return False
+
+            logger.info("Ожидание готовности Kafka в поде %s, таймаут %s сек", pod_name, timeout)
+
+            # Все проверки выполняются одной exec-сессией на каждую попытку
+            delay = 0.25
+            while time.monotonic() < deadline:
+                result = await self.exec_command_in_pod(
+                    pod_name=pod_name,
+                    namespace=namespace,
+                    command=KAFKA_PROBE_COMMAND,
+                    timeout=min(10, deadline - time.monotonic()),
+                )
+                if result is not None:
+                    for tag, description in KAFKA_READY_TAGS:
+                        if tag in result:
+                            logger.info("Kafka в поде %s готова (%s)", pod_name, description)
+                            return True
+
+                # Ждем перед следующей попыткой с экспоненциальной задержкой и случайным разбросом, не выходя за дедлайн
+                await asyncio.sleep(max(0, min(delay + random.uniform(0, delay * 0.2), deadline - time.monotonic())))
+                delay = min(delay * 1.5, 2.0)
+
+            logger.warning("Таймаут ожидания готовности Kafka в поде %s (%s сек)", pod_name, timeout)
+            return False
+        except Exception as e:
+            logger.error("Ошибка при ожидании готовности Kafka в поде %s: %s", pod_name, e)
+            return False
@@ -0,0 +1,28 @@
+import re
+
+__all__ = [
+    "KAFKA_API_VERSIONS_COMMAND",
+    "KAFKA_ERR",
+    "KAFKA_OK",
+    "KAFKA_READY_PATTERN",
+    "KAFKA_TOPICS_COMMAND",
+]
+
+# Сообщение о запуске брокера в логах; ищется как регулярное выражение, поэтому скобки экранированы
+KAFKA_READY_PATTERN = re.escape("started (kafka.server.KafkaServer)")
+
+# Маркеры в выводе проверок готовности Kafka (сравниваются с байтами без декодирования)
+KAFKA_ERR = b"Error"
+KAFKA_OK = b"Supported"
+
+# Проверки готовности Kafka внутри контейнера: скрипты с суффиксом .sh и без него (разные образы)
+KAFKA_TOPICS_COMMAND = [
+    "/bin/sh",
+    "-c",
+    "kafka-topics.sh --list --bootstrap-server localhost:9092 2>/dev/null || kafka-topics --list --bootstrap-server localhost:9092 2>/dev/null",
+]
+KAFKA_API_VERSIONS_COMMAND = [
+    "/bin/sh",
+    "-c",
+    "kafka-broker-api-versions.sh --bootstrap-server localhost:9092 2>/dev/null || kafka-broker-api-versions --bootstrap-server localhost:9092 2>/dev/null",
+]
@@ -1,24 +1,70 @@
-from testcontainers.core.container import DockerContainer
-from testcontainers.core.waiting_utils import wait_for_logs
-import docker
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from container_common import KAFKA_API_VERSIONS_COMMAND, KAFKA_ERR, KAFKA_OK, KAFKA_READY_PATTERN, KAFKA_TOPICS_COMMAND
+from typing import TYPE_CHECKING, Optional, Dict, List, Set
+import re
+import threading
 import time
 import logging
 
+# docker и testcontainers (вместе с requests/urllib3) импортируются лениво, при первом использовании
+if TYPE_CHECKING:
+    import docker
+    from testcontainers.core.container import DockerContainer
+
 # Настраиваем логирование, используя тот же формат
 logger = logging.getLogger("container_operations")
 
+# Общий Docker клиент для всех экземпляров ContainerOperations
+_client_lock = threading.Lock()
+_shared_client: Optional["docker.DockerClient"] = None
+
+
+def _get_client() -> "docker.DockerClient":
+    """
+    Возвращает общий Docker клиент, создавая его при первом обращении
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                import docker
+
+                _shared_client = docker.from_env()
+    return _shared_client
+
 
 class ContainerOperations:
+    # Образы, уже подтянутые в текущем процессе (общие для всех экземпляров)
+    _pulled_images: Set[str] = set()
+    _pull_lock = threading.Lock()
+
     def __init__(self):
         try:
-            self.client = docker.from_env()
+            self.client = _get_client()
             self.containers = {}
+            self._docker_containers: Dict[str, "docker.models.containers.Container"] = {}
+            self._lock = threading.Lock()
+            self._executor: Optional[ThreadPoolExecutor] = None
             logger.info("Docker клиент инициализирован успешно")
         except Exception as e:
-            logger.error(f"Ошибка при инициализации Docker клиента: {e}")
+            logger.error("Ошибка при инициализации Docker клиента: %s", e)
             raise
 
+    def __enter__(self) -> "ContainerOperations":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Возвращает общий пул потоков для параллельных операций (создается при первом обращении)
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="container-ops")
+            return self._executor
+
     def start_container(
         self,
         name: str,
@@ -29,7 +75,7 @@ class ContainerOperations:
         network_mode: str = "bridge",
         volumes: Optional[Dict[str, str]] = None,
         pull_image: bool = False,
-    ) -> DockerContainer:
+    ) -> "DockerContainer":
         """
         Запускает контейнер с заданными параметрами
 
@@ -44,95 +90,250 @@ class ContainerOperations:
             pull_image: Нужно ли подтягивать образ перед запуском
         """
         try:
-            logger.info(f"Запуск контейнера {name} (образ: {image})")
+            logger.info("Запуск контейнера %s (образ: %s)", name, image)
 
             # Проверяем, не запущен ли уже контейнер с таким именем
             if name in self.containers:
-                logger.warning(f"Контейнер с именем {name} уже запущен, останавливаем его")
+                logger.warning("Контейнер с именем %s уже запущен, останавливаем его", name)
                 self.stop_container(name)
 
-            # Подтягиваем образ, если нужно
-            if pull_image:
-                logger.info(f"Подтягиваем образ {image}")
-                try:
-                    self.client.images.pull(image)
-                except Exception as e:
-                    logger.warning(f"Не удалось подтянуть образ {image}: {e}")
-
-            container = DockerContainer(image)
+            container = self._build_container(name, image, environment, ports, command, network_mode, volumes)
+            return self._run_container(name, container, pull_image)
 
-            if name:
-                container.with_name(name)
-                logger.debug(f"Установлено имя контейнера: {name}")
+        except Exception as e:
+            logger.error("Ошибка при запуске контейнера %s: %s", name, e)
+            return None
 
-            if environment:
-                for key, value in environment.items():
-                    container.with_env(key, value)
-                logger.debug(f"Установлены переменные окружения: {environment}")
+    def start_containers(self, specs: List[dict]) -> Dict[str, Optional["DockerContainer"]]:
+        """
+        Запускает несколько контейнеров параллельно
 
-            if ports:
-                for container_port, host_port in ports.items():
-                    container.with_bind_ports(container_port, host_port)
-                logger.debug(f"Установлены порты: {ports}")
+        Контейнеры конфигурируются в текущем потоке, а подтягивание образов и
+        container.start() выполняются в пуле потоков, так что общее время запуска
+        примерно равно времени запуска самого медленного контейнера.
 
-            if command:
-                container.with_command(command)
-                logger.debug(f"Установлена команда: {command}")
+        Args:
+            specs: Список параметров контейнеров (аргументы start_container)
 
-            if volumes:
-                for host_path, container_path in volumes.items():
-                    container.with_volume_mapping(host_path, container_path)
-                logger.debug(f"Установлены тома: {volumes}")
+        Returns:
+            dict: {имя контейнера: DockerContainer или None в случае ошибки}
+        """
+        results = {}
+        futures = {}
+        executor = self._get_executor()
+        for spec in specs:
+            spec = dict(spec)
+            name = spec.pop("name")
+            pull_image = spec.pop("pull_image", False)
+            try:
+                logger.info("Запуск контейнера %s (образ: %s)", name, spec["image"])
+
+                if name in self.containers:
+                    logger.warning("Контейнер с именем %s уже запущен, останавливаем его", name)
+                    self.stop_container(name)
+
+                container = self._build_container(name, **spec)
+            except Exception as e:
+                logger.error("Ошибка при запуске контейнера %s: %s", name, e)
+                results[name] = None
+                continue
+
+            futures[executor.submit(self._run_container, name, container, pull_image)] = name
+
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+        return results
+
+    def _build_container(
+        self,
+        name: str,
+        image: str,
+        environment: Optional[Dict[str, str]] = None,
+        ports: Optional[Dict[int, int]] = None,
+        command: Optional[str] = None,
+        network_mode: str = "bridge",
+        volumes: Optional[Dict[str, str]] = None,
+    ) -> "DockerContainer":
+        """
+        Конфигурирует контейнер без запуска
+        """
+        from testcontainers.core.container import DockerContainer
+
+        container = DockerContainer(image)
+
+        if name:
+            container.with_name(name)
+            logger.debug("Установлено имя контейнера: %s", name)
+
+        # Приводим параметры к типам Docker API один раз и передаем их целиком
+        container.env = {str(key): str(value) for key, value in (environment or {}).items()}
+        # Порты передаются как есть: docker-py принимает ключи вида "9092/tcp", None и кортежи (ip, port)
+        container.ports = dict(ports or {})
+        # Тот же формат, что и у with_volume_mapping (режим только для чтения)
+        container.volumes = {
+            str(host_path): {"bind": str(container_path), "mode": "ro"}
+            for host_path, container_path in (volumes or {}).items()
+        }
+        logger.debug(
+            "Установлены переменные окружения: %s, порты: %s, тома: %s", container.env, container.ports, volumes
+        )
+
+        if command:
+            container.with_command(command)
+            logger.debug("Установлена команда: %s", command)
+
+        container.with_kwargs(network_mode=network_mode)
+        logger.debug("Установлен режим сети: %s", network_mode)
+
+        return container
+
+    def _run_container(
+        self, name: str, container: "DockerContainer", pull_image: bool = False
+    ) -> Optional["DockerContainer"]:
+        """
+        Подтягивает образ (если нужно), запускает сконфигурированный контейнер и регистрирует его
+        """
+        try:
+            started_at = time.time()
+            logger.debug("Контейнер %s: начало запуска в %.3f", name, started_at)
 
-            container.with_kwargs(network_mode=network_mode)
-            logger.debug(f"Установлен режим сети: {network_mode}")
+            # Подтягиваем образ, если нужно
+            if pull_image:
+                self._pull_image(container.image)
 
             container.start()
-            self.containers[name] = container
-
-            logger.info(f"Контейнер {name} успешно запущен")
+            with self._lock:
+                self.containers[name] = container
+                # Кэшируем docker-объект контейнера, чтобы не запрашивать его по id при каждом вызове
+                self._docker_containers[name] = container.get_wrapped_container()
+
+            finished_at = time.time()
+            logger.debug("Контейнер %s: конец запуска в %.3f", name, finished_at)
+            logger.info("Контейнер %s успешно запущен за %.2f сек", name, finished_at - started_at)
             return container
 
         except Exception as e:
-            logger.error(f"Ошибка при запуске контейнера {name}: {e}")
+            logger.error("Ошибка при запуске контейнера %s: %s", name, e)
             return None
 
+    def _pull_image(self, image: str) -> bool:
+        """
+        Подтягивает образ, если он еще не был подтянут в текущем процессе
+
+        Returns:
+            bool: True если образ доступен, False в случае ошибки
+        """
+        if image in self._pulled_images:
+            logger.debug("Образ %s уже подтянут, пропускаем", image)
+            return True
+
+        logger.info("Подтягиваем образ %s", image)
+        try:
+            self.client.images.pull(image)
+        except Exception as e:
+            logger.warning("Не удалось подтянуть образ %s: %s", image, e)
+            return False
+
+        with self._pull_lock:
+            self._pulled_images.add(image)
+        return True
+
+    def prewarm_images(self, images: List[str]) -> bool:
+        """
+        Параллельно подтягивает образы заранее, до запуска контейнеров
+
+        Args:
+            images: Список образов
+
+        Returns:
+            bool: True если все образы подтянуты, False если хотя бы один не удалось подтянуть
+        """
+        missing = set(images) - self._pulled_images
+        if not missing:
+            return True
+
+        logger.info("Предварительное подтягивание образов: %s", sorted(missing))
+        return all(self._get_executor().map(self._pull_image, missing))
+
     def stop_container(self, name: str) -> bool:
         """
         Останавливает контейнер по имени
         """
         try:
-            if name in self.containers:
-                logger.info(f"Останавливаем контейнер {name}")
-                container = self.containers[name]
-                container.stop()
-                del self.containers[name]
-                logger.info(f"Контейнер {name} остановлен")
-                return True
-            else:
-                logger.warning(f"Контейнер {name} не найден")
+            container = self.containers.pop(name, None)
+            if container is None:
+                logger.warning("Контейнер %s не найден", name)
                 return False
+
+            self._docker_containers.pop(name, None)
+            logger.info("Останавливаем контейнер %s", name)
+            container.stop()
+            logger.info("Контейнер %s остановлен", name)
+            return True
         except Exception as e:
-            logger.error(f"Ошибка при остановке контейнера {name}: {e}")
+            logger.error("Ошибка при остановке контейнера %s: %s", name, e)
             return False
 
-    def wait_for_container_log(self, name: str, message: str, timeout: int = 30) -> bool:
+    def wait_for_container_log(self, name: str, message: str, timeout: float = 30) -> bool:
         """
         Ожидает появления определенного сообщения в логах контейнера
         """
+        return self.wait_for_log_streaming(name, message, timeout)
+
+    def wait_for_log_streaming(self, name: str, pattern: str, timeout: float = 30) -> bool:
+        """
+        Ожидает появления сообщения в логах контейнера, читая поток логов
+
+        Логи читаются один раз по мере поступления (follow), каждая порция
+        проверяется регулярным выражением, без повторного чтения всего буфера.
+
+        Args:
+            name: Имя контейнера
+            pattern: Регулярное выражение для поиска
+            timeout: Таймаут ожидания в секундах
+
+        Returns:
+            bool: True если сообщение найдено, False в случае ошибки или таймаута
+        """
         try:
-            if name in self.containers:
-                logger.info(
-                    f"Ожидание появления сообщения '{message}' в логах контейнера {name}, таймаут {timeout} сек"
-                )
-                container = self.containers[name]
-                wait_for_logs(container, message, timeout)
-                logger.info(f"Сообщение '{message}' найдено в логах контейнера {name}")
+            docker_container = self._get_docker_container(name)
+            if docker_container is None:
+                logger.warning("Контейнер %s не найден для ожидания лога", name)
+                return False
+
+            logger.info(
+                "Ожидание появления сообщения '%s' в логах контейнера %s, таймаут %s сек", pattern, name, timeout
+            )
+            # MULTILINE, как в wait_for_logs из testcontainers: ^ и $ срабатывают на границах строк
+            regex = re.compile(pattern, re.MULTILINE)
+            found = threading.Event()
+            log_stream = docker_container.logs(stream=True, follow=True, stdout=True, stderr=True)
+
+            def _scan():
+                # Храним только незавершенную строку, чтобы находить сообщения на стыке порций
+                buffer = ""
+                try:
+                    for chunk in log_stream:
+                        buffer += chunk.decode("utf-8", errors="replace")
+                        if regex.search(buffer):
+                            found.set()
+                            return
+                        buffer = buffer[buffer.rfind("\n") + 1 :]
+                except Exception as e:
+                    logger.debug("Чтение потока логов контейнера %s прервано: %s", name, e)
+
+            wait([self._get_executor().submit(_scan)], timeout=timeout)
+            log_stream.close()
+
+            if found.is_set():
+                logger.info("Сообщение '%s' найдено в логах контейнера %s", pattern, name)
                 return True
-            logger.warning(f"Контейнер {name} не найден для ожидания лога")
+
+            logger.warning("Сообщение '%s' не найдено в логах контейнера %s за %s сек", pattern, name, timeout)
             return False
         except Exception as e:
-            logger.error(f"Ошибка при ожидании лога в контейнере {name}: {e}")
+            logger.error("Ошибка при ожидании лога в контейнере %s: %s", name, e)
             return False
 
     def get_container_logs(self, name: str, tail: int = 100) -> Optional[str]:
@@ -147,24 +348,38 @@ class ContainerOperations:
             str: Логи контейнера или None в случае ошибки
         """
         try:
-            if name in self.containers:
-                logger.debug(f"Получение логов контейнера {name}")
-                container = self.containers[name]
-                logs = container.get_logs()
-
-                # Если нужно ограничить количество строк
-                if tail > 0 and logs:
-                    logs_lines = logs.strip().split("\n")
-                    if len(logs_lines) > tail:
-                        logs = "\n".join(logs_lines[-tail:])
-
-                return logs
-            logger.warning(f"Контейнер {name} не найден для получения логов")
-            return None
+            docker_container = self._get_docker_container(name)
+            if docker_container is None:
+                logger.warning("Контейнер %s не найден для получения логов", name)
+                return None
+
+            logger.debug("Получение логов контейнера %s", name)
+            # Ограничиваем количество строк на стороне Docker daemon (GET /containers/{id}/logs?tail=N)
+            logs = docker_container.logs(stdout=True, stderr=True, tail=tail if tail > 0 else "all")
+            return logs.decode("utf-8", errors="replace")
         except Exception as e:
-            logger.error(f"Ошибка при получении логов контейнера {name}: {e}")
+            logger.error("Ошибка при получении логов контейнера %s: %s", name, e)
             return None
 
+    def _get_docker_container(self, name: str) -> Optional["docker.models.containers.Container"]:
+        """
+        Возвращает docker-объект контейнера из кэша, при промахе запрашивает его по id
+
+        Returns:
+            Объект контейнера или None, если контейнер с таким именем не запущен
+        """
+        docker_container = self._docker_containers.get(name)
+        if docker_container is not None:
+            return docker_container
+
+        container = self.containers.get(name)
+        if container is None:
+            return None
+
+        docker_container = self.client.containers.get(container.get_wrapped_container().id)
+        self._docker_containers[name] = docker_container
+        return docker_container
+
     def get_container_status(self, name: str) -> Optional[str]:
         """
         Получает статус контейнера
@@ -176,17 +391,18 @@ class ContainerOperations:
             str: Статус контейнера или None в случае ошибки
         """
         try:
-            if name in self.containers:
-                container = self.containers[name]
-                # Обновляем информацию о контейнере
-                docker_container = self.client.containers.get(container.get_wrapped_container().id)
-                status = docker_container.status
-                logger.debug(f"Статус контейнера {name}: {status}")
-                return status
-            logger.warning(f"Контейнер {name} не найден для получения статуса")
-            return None
+            docker_container = self._get_docker_container(name)
+            if docker_container is None:
+                logger.warning("Контейнер %s не найден для получения статуса", name)
+                return None
+
+            # Обновляем информацию о контейнере
+            docker_container.reload()
+            status = docker_container.status
+            logger.debug("Статус контейнера %s: %s", name, status)
+            return status
         except Exception as e:
-            logger.error(f"Ошибка при получении статуса контейнера {name}: {e}")
+            logger.error("Ошибка при получении статуса контейнера %s: %s", name, e)
             return None
 
     def exec_in_container(self, name: str, command: List[str]) -> Optional[str]:
@@ -200,18 +416,32 @@ class ContainerOperations:
         Returns:
             str: Результат выполнения команды или None в случае ошибки
         """
-        try:
-            if name in self.containers:
-                logger.info(f"Выполнение команды {command} в контейнере {name}")
-                container = self.containers[name]
-                docker_container = self.client.containers.get(container.get_wrapped_container().id)
-                result = docker_container.exec_run(command)
-                output = result.output.decode("utf-8")
-                return output
-            logger.warning(f"Контейнер {name} не найден для выполнения команды")
+        output = self.exec_in_container_bytes(name, command)
+        if output is None:
             return None
+        return output.decode("utf-8")
+
+    def exec_in_container_bytes(self, name: str, command: List[str]) -> Optional[bytes]:
+        """
+        Выполняет команду в контейнере и возвращает вывод без декодирования
+
+        Args:
+            name: Имя контейнера
+            command: Команда для выполнения в виде списка
+
+        Returns:
+            bytes: Результат выполнения команды или None в случае ошибки
+        """
+        try:
+            docker_container = self._get_docker_container(name)
+            if docker_container is None:
+                logger.warning("Контейнер %s не найден для выполнения команды", name)
+                return None
+
+            logger.info("Выполнение команды %s в контейнере %s", command, name)
+            return docker_container.exec_run(command).output
         except Exception as e:
-            logger.error(f"Ошибка при выполнении команды в контейнере {name}: {e}")
+            logger.error("Ошибка при выполнении команды в контейнере %s: %s", name, e)
             return None
 
     def wait_for_kafka_ready(self, container_name: str, timeout: int = 120) -> bool:
@@ -225,64 +455,72 @@ class ContainerOperations:
         Returns:
             bool: True если Kafka готова, False в случае ошибки или таймаута
         """
+        # Общий дедлайн для всех способов проверки, чтобы не превышать таймаут вызывающего кода
+        deadline = time.monotonic() + timeout
         try:
-            logger.info(f"Ожидание готовности Kafka в контейнере {container_name}, таймаут {timeout} сек")
+            logger.info("Ожидание готовности Kafka в контейнере %s, таймаут %s сек", container_name, timeout)
 
             # Проверяем существование контейнера
             if container_name not in self.containers:
-                logger.error(f"Контейнер {container_name} не найден")
+                logger.error("Контейнер %s не найден", container_name)
                 return False
 
-            # Способ 1: Ожидание характерного сообщения в логах
-            kafka_ready_message = "started (kafka.server.KafkaServer)"
-            if self.wait_for_container_log(container_name, kafka_ready_message, timeout):
-                logger.info(f"Kafka в контейнере {container_name} готова (по логам)")
+            # Способ 1: Ожидание характерного сообщения в логах (~30% бюджета времени, не более 30 сек)
+            log_timeout = min(30, timeout * 0.3)
+            if self.wait_for_container_log(container_name, KAFKA_READY_PATTERN, timeout=log_timeout):
+                logger.info("Kafka в контейнере %s готова (по логам)", container_name)
                 return True
 
-            # Способ 2: Проверка с помощью kafka-topics или kafka-broker-api-versions
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                # Проверка работоспособности с помощью команды kafka-topics
-                result = self.exec_in_container(
-                    container_name,
-                    [
-                        "/bin/sh",
-                        "-c",
-                        "kafka-topics.sh --list --bootstrap-server localhost:9092 2>/dev/null || kafka-topics --list --bootstrap-server localhost:9092 2>/dev/null",
-                    ],
-                )
-
-                if result is not None and not "Error" in result:
-                    logger.info(f"Kafka в контейнере {container_name} готова (по проверке команды)")
-                    return True
-
-                # Альтернативная проверка с помощью kafka-broker-api-versions
-                result = self.exec_in_container(
-                    container_name,
-                    [
-                        "/bin/sh",
-                        "-c",
-                        "kafka-broker-api-versions.sh --bootstrap-server localhost:9092 2>/dev/null || kafka-broker-api-versions --bootstrap-server localhost:9092 2>/dev/null",
-                    ],
-                )
-
-                if result is not None and "Supported" in result:
-                    logger.info(f"Kafka в контейнере {container_name} готова (по проверке API версий)")
-                    return True
-
-                # Ждем перед следующей попыткой
-                time.sleep(5)
-
-            logger.warning(f"Таймаут ожидания готовности Kafka в контейнере {container_name} ({timeout} сек)")
+            # Способ 2: Параллельная проверка с помощью kafka-topics и kafka-broker-api-versions
+            probes = [
+                (self._probe_kafka_topics, "по проверке команды"),
+                (self._probe_kafka_api_versions, "по проверке API версий"),
+            ]
+            delay = 0.2
+            executor = self._get_executor()
+            while time.monotonic() < deadline:
+                futures = {executor.submit(probe, container_name): description for probe, description in probes}
+                for future in as_completed(futures):
+                    if future.result():
+                        logger.info("Kafka в контейнере %s готова (%s)", container_name, futures[future])
+                        return True
+
+                # Ждем перед следующей попыткой с экспоненциальной задержкой, не выходя за дедлайн
+                time.sleep(max(0, min(delay, deadline - time.monotonic())))
+                delay = min(delay * 1.5, 2.0)
+
+            logger.warning("Таймаут ожидания готовности Kafka в контейнере %s (%s сек)", container_name, timeout)
             return False
         except Exception as e:
-            logger.error(f"Ошибка при ожидании готовности Kafka в контейнере {container_name}: {e}")
+            logger.error("Ошибка при ожидании готовности Kafka в контейнере %s: %s", container_name, e)
             return False
 
+    def _probe_kafka_topics(self, container_name: str) -> bool:
+        """
+        Проверяет работоспособность Kafka с помощью команды kafka-topics
+        """
+        result = self.exec_in_container_bytes(container_name, KAFKA_TOPICS_COMMAND)
+        return result is not None and result.find(KAFKA_ERR) == -1
+
+    def _probe_kafka_api_versions(self, container_name: str) -> bool:
+        """
+        Проверяет работоспособность Kafka с помощью команды kafka-broker-api-versions
+        """
+        result = self.exec_in_container_bytes(container_name, KAFKA_API_VERSIONS_COMMAND)
+        return result is not None and result.find(KAFKA_OK) != -1
+
     def cleanup(self):
         """
-        Останавливает все запущенные контейнеры
+        Останавливает все запущенные контейнеры и завершает общий пул потоков
         """
-        logger.info(f"Очистка всех контейнеров ({len(self.containers)} шт.)")
-        for name in list(self.containers.keys()):
-            self.stop_container(name)
+        names = list(self.containers.keys())
+        logger.info("Очистка всех контейнеров (%s шт.)", len(names))
+
+        # Останавливаем контейнеры параллельно: Docker daemon обрабатывает остановку независимо
+        if names:
+            list(self._get_executor().map(self.stop_container, names))
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,5 +1,8 @@
 from k8s_operations import KubernetesOperations
 from container_operations import ContainerOperations
+from kafka_presets import KAFKA_CONTAINER_NAME, KAFKA_IMAGE, ZOOKEEPER_IMAGE, start_kafka_stack
+import signal
+import threading
 import time
 
 
@@ -9,38 +12,18 @@ def main():
     containers = ContainerOperations()
 
     try:
-        # Запускаем контейнер с Kafka
-        container = containers.start_container(
-            name="kafka-container",
-            image="confluentinc/cp-kafka:latest",
-            ports={9092: 9092, 9093: 9093},
-            environment={
-                "KAFKA_ADVERTISED_LISTENERS": "PLAINTEXT://localhost:9092,PLAINTEXT_HOST://localhost:9093",
-                "KAFKA_LISTENER_SECURITY_PROTOCOL_MAP": "PLAINTEXT:PLAINTEXT,PLAINTEXT_HOST:PLAINTEXT",
-                "KAFKA_INTER_BROKER_LISTENER_NAME": "PLAINTEXT",
-                "KAFKA_BROKER_ID": "1",
-                "KAFKA_OFFSETS_TOPIC_REPLICATION_FACTOR": "1",
-                "KAFKA_GROUP_INITIAL_REBALANCE_DELAY_MS": "0",
-                "KAFKA_TRANSACTION_STATE_LOG_MIN_ISR": "1",
-                "KAFKA_TRANSACTION_STATE_LOG_REPLICATION_FACTOR": "1",
-                "KAFKA_ZOOKEEPER_CONNECT": "zookeeper:2181",
-            },
-        )
+        # Заранее подтягиваем образы параллельно
+        containers.prewarm_images([KAFKA_IMAGE, ZOOKEEPER_IMAGE])
 
-        # Запускаем контейнер с Zookeeper (необходим для Kafka)
-        zookeeper_container = containers.start_container(
-            name="zookeeper",
-            image="confluentinc/cp-zookeeper:latest",
-            ports={2181: 2181},
-            environment={"ZOOKEEPER_CLIENT_PORT": "2181", "ZOOKEEPER_TICK_TIME": "2000"},
-        )
+        # Запускаем Zookeeper (необходим для Kafka) и Kafka параллельно
+        container, zookeeper_container = start_kafka_stack(containers)
 
         if container and zookeeper_container:
             print("Ожидаем запуска контейнеров...")
             time.sleep(5)  # Даем контейнерам время на запуск
 
             # Ожидаем готовности Kafka в контейнере
-            if containers.wait_for_kafka_ready("kafka-container", timeout=120):
+            if containers.wait_for_kafka_ready(KAFKA_CONTAINER_NAME, timeout=120):
                 print("Kafka в контейнере готова к использованию!")
             else:
                 print("Не удалось дождаться готовности Kafka в контейнере")
@@ -73,16 +56,20 @@ def main():
             print("- Zookeeper: localhost:2181")
             print("Нажмите Ctrl+C для завершения...")
 
-            while True:
-                time.sleep(1)
+            # Блокируемся до сигнала завершения без периодических пробуждений
+            stop = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            stop.wait()
+            print("\nЗавершение работы...")
 
     except KeyboardInterrupt:
         print("\nЗавершение работы...")
     finally:
         # Очистка ресурсов
         print("Очистка ресурсов...")
-        k8s.cleanup()
         k8s.delete_deployment("kafka-deployment")
+        k8s.cleanup()
         containers.cleanup()
 
 
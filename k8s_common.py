@@ -0,0 +1,161 @@
+from typing import Optional
+import functools
+import json
+import operator
+import os
+import types
+import yaml
+import logging
+
+# Используем C-реализацию загрузчика (libyaml), если она доступна
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# orjson (необязательная зависимость) разбирает JSON-манифесты быстрее модуля json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("k8s_common")
+
+__all__ = [
+    "KAFKA_PROBE_COMMAND",
+    "KAFKA_PROBE_SCRIPT",
+    "KAFKA_READY_TAGS",
+    "NODEPORT_SERVICE_TEMPLATE",
+    "RESOURCE_READERS",
+    "container_ready",
+    "deployment_selector",
+    "format_label_selector",
+    "is_pod_ready",
+    "load_yaml",
+    "load_yaml_all",
+    "manifest_version",
+    "normalize_selector",
+]
+
+if not yaml.__with_libyaml__:
+    logger.warning("PyYAML собран без libyaml, разбор манифестов будет выполняться медленной Python-реализацией")
+
+# Все проверки готовности Kafka одним скриптом: первая успешная проверка печатает свой маркер
+KAFKA_PROBE_SCRIPT = (
+    "( (kafka-topics.sh --list --bootstrap-server localhost:9092 || kafka-topics --list --bootstrap-server localhost:9092)"
+    " >/dev/null 2>&1 && echo READY_TOPICS )"
+    " || ( (kafka-broker-api-versions.sh --bootstrap-server localhost:9092"
+    " || kafka-broker-api-versions --bootstrap-server localhost:9092) 2>/dev/null | grep -q Supported && echo READY_API )"
+    " || ( grep -qs 'started (kafka.server.KafkaServer)' /var/log/kafka/server.log /logs/server.log && echo READY_LOG )"
+)
+KAFKA_PROBE_COMMAND = ["/bin/sh", "-c", KAFKA_PROBE_SCRIPT]
+# Маркер в выводе KAFKA_PROBE_COMMAND -> описание проверки для лога
+KAFKA_READY_TAGS = (
+    ("READY_TOPICS", "по проверке команды"),
+    ("READY_API", "по проверке API версий"),
+    ("READY_LOG", "по логам"),
+)
+
+# Неизменяемая часть манифеста NodePort service; на каждый вызов дополняется только изменяемыми полями
+NODEPORT_SERVICE_TEMPLATE = types.MappingProxyType({"apiVersion": "v1", "kind": "Service"})
+# Тип ресурса -> (атрибут API, метод чтения ресурса) для resource_exists
+RESOURCE_READERS = types.MappingProxyType(
+    {
+        "deployment": ("apps_v1", "read_namespaced_deployment"),
+        "service": ("v1", "read_namespaced_service"),
+        "pod": ("v1", "read_namespaced_pod"),
+    }
+)
+
+# Поле готовности статуса контейнера (словарь из события watch); map с itemgetter обходится без генератора
+container_ready = operator.itemgetter("ready")
+
+
+def is_pod_ready(pod: dict) -> bool:
+    """
+    Проверяет, что под (словарь из события watch) запущен и все его контейнеры готовы
+    """
+    status = pod.get("status") or {}
+    if status.get("phase") != "Running":
+        return False
+    container_statuses = status.get("containerStatuses")
+    return bool(container_statuses) and all(map(container_ready, container_statuses))
+
+
+def manifest_version(path: str) -> int:
+    """
+    Возвращает версию файла для ключа кэша: время изменения в наносекундах (точнее, чем float от getmtime)
+    """
+    return os.stat(path).st_mtime_ns
+
+
+def _load_json(f) -> dict:
+    """
+    Разбирает JSON-манифест из открытого в бинарном режиме файла: через orjson, если он установлен
+    """
+    if orjson is not None:
+        return orjson.loads(f.read())
+    return json.load(f)
+
+
+@functools.lru_cache(maxsize=64)
+def load_yaml(path: str, mtime: int) -> dict:
+    """
+    Загружает YAML файл; результат кэшируется по пути и времени изменения файла
+
+    Манифесты с расширением .json разбираются JSON-парсером (orjson или json), который быстрее YAML-парсера.
+    Возвращаемый объект общий для всех вызовов, его нельзя изменять.
+    """
+    with open(path, "rb") as f:
+        if path.endswith(".json"):
+            return _load_json(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@functools.lru_cache(maxsize=64)
+def load_yaml_all(path: str, mtime: int) -> tuple:
+    """
+    Загружает все документы YAML файла (разделенные ---); результат кэшируется как и в load_yaml
+
+    Возвращаемые объекты общие для всех вызовов, их нельзя изменять.
+    """
+    with open(path, "rb") as f:
+        if path.endswith(".json"):
+            return (_load_json(f),)
+        return tuple(document for document in yaml.load_all(f, Loader=SafeLoader) if document)
+
+
+@functools.lru_cache(maxsize=128)
+def format_label_selector(labels: frozenset) -> str:
+    """
+    Форматирует метки {(ключ, значение)} в селектор "k1=v1,k2=v2"; результат кэшируется по набору меток
+    """
+    return ",".join(f"{k}={v}" for k, v in sorted(labels))
+
+
+@functools.lru_cache(maxsize=256)
+def normalize_selector(label_selector: str) -> str:
+    """
+    Приводит строку селектора меток к каноническому виду: без пробелов, требования отсортированы
+
+    Одинаковые по смыслу селекторы ("b=2, a=1" и "a=1,b=2") дают один ключ кэша.
+    Селекторы с множествами (in/notin) содержат запятые внутри скобок и возвращаются без сортировки.
+    """
+    label_selector = label_selector.strip()
+    if "(" in label_selector:
+        return label_selector
+    return ",".join(sorted(requirement.strip() for requirement in label_selector.split(",") if requirement.strip()))
+
+
+@functools.lru_cache(maxsize=64)
+def deployment_selector(path: str, mtime: int) -> Optional[str]:
+    """
+    Возвращает селектор меток подов deployment из файла (None, если matchLabels не задан)
+
+    Строка строится один раз на версию файла и кэшируется вместе с разобранным манифестом.
+    """
+    dep = load_yaml(path, mtime)
+    labels = dep.get("spec", {}).get("selector", {}).get("matchLabels")
+    if not labels:
+        return None
+    return format_label_selector(frozenset(labels.items()))
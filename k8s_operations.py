@@ -1,27 +1,190 @@
-from kubernetes import client, config
-from kubernetes.stream import stream
-import yaml
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from k8s_common import (
+    KAFKA_PROBE_SCRIPT,
+    KAFKA_READY_TAGS,
+    NODEPORT_SERVICE_TEMPLATE,
+    RESOURCE_READERS,
+    deployment_selector,
+    is_pod_ready,
+    load_yaml,
+    manifest_version,
+    normalize_selector,
+)
+from typing import Dict, List, Optional, Set, Tuple
+import copy
+import functools
+import inspect
+import random
+import threading
 import time
 import logging
 
+# orjson (необязательная зависимость) разбирает JSON-ответы API-сервера в несколько раз быстрее модуля json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("k8s_operations")
 
+__all__ = ["KubernetesOperations"]
+
+# Маркер конца вывода команды в долгоживущей shell-сессии
+_SHELL_DONE = "__K8S_REMOTE_DONE__"
+
+
+@functools.lru_cache(maxsize=8)
+def _kube_configuration(context: Optional[str]):
+    """
+    Загружает kubeconfig для контекста один раз на процесс
+
+    Возвращаемый объект общий для всех вызовов, его нельзя изменять: каждый клиент работает с копией.
+    """
+    from kubernetes import client, config
+
+    config.load_kube_config(context=context)
+    return client.Configuration.get_default_copy()
+
+
+@functools.lru_cache(maxsize=1)
+def _api_client_class():
+    """
+    Возвращает класс ApiClient; при установленном orjson - подкласс, разбирающий ответы через orjson
+    """
+    from kubernetes import client
+
+    if orjson is None:
+        return client.ApiClient
+
+    class _OrjsonApiClient(client.ApiClient):
+        def deserialize(self, response, response_type):
+            if response_type == "file":
+                return super().deserialize(response, response_type)
+            try:
+                data = orjson.loads(response.data)
+            except (orjson.JSONDecodeError, TypeError):
+                data = response.data
+            return self._ApiClient__deserialize(data, response_type)
+
+    return _OrjsonApiClient
+
+
+def _close_late_connection(future):
+    """
+    Закрывает WebSocket-соединение, установленное уже после истечения таймаута подключения
+    """
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _keepalive_socket_options() -> list:
+    """
+    Возвращает опции сокета urllib3 с включенным TCP keep-alive
+
+    Простаивающие соединения пула не обрываются промежуточными балансировщиками и NAT,
+    поэтому следующий запрос не получает ReadTimeoutError и не тратит время на новое TLS-рукопожатие.
+    """
+    import socket
+    from urllib3.connection import HTTPConnection
+
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Параметры keep-alive доступны не на всех платформах (например, TCP_KEEPIDLE отсутствует на macOS)
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 6)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+def _safe_api(message: str, default=None):
+    """
+    Декоратор для методов API: логирует исключение и возвращает значение по умолчанию
+
+    Args:
+        message: Текст ошибки; поля вида {name} заполняются аргументами вызова метода
+        default: Значение, возвращаемое в случае ошибки
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                # Аргументы связываются только при ошибке, успешный вызов не платит за форматирование
+                arguments = signature.bind(*args, **kwargs)
+                arguments.apply_defaults()
+                logger.error("%s: %s", message.format(**arguments.arguments), e)
+                return default
+
+        return wrapper
+
+    return decorator
+
 
 class KubernetesOperations:
+    # Имя владельца полей при server-side apply
+    _FIELD_MANAGER = "k8s-remote"
+    # Время жизни закэшированного результата проверки существования ресурса, сек
+    _EXISTS_TTL = 5.0
+    # Время жизни закэшированного имени пода, найденного по метке, сек
+    _POD_NAME_TTL = 10.0
+    # Тип ресурса -> (атрибут API, метод списка по всем namespace, метод списка в namespace) для информеров
+    _INFORMER_LISTS = {
+        "deployment": ("apps_v1", "list_deployment_for_all_namespaces", "list_namespaced_deployment"),
+        "service": ("v1", "list_service_for_all_namespaces", "list_namespaced_service"),
+        "pod": ("v1", "list_pod_for_all_namespaces", "list_namespaced_pod"),
+    }
+
     def __init__(self, context=None):
         # Загружаем конфигурацию из файла ~/.kube/config
         try:
-            if context:
-                config.load_kube_config(context=context)
-            else:
-                config.load_kube_config()
-            self.v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
+            # kubernetes.client тянет сотни сгенерированных моделей, поэтому импортируется при создании клиента,
+            # а не при импорте модуля
+            from kubernetes import client
+            from urllib3.util.retry import Retry
+
+            # kubeconfig разбирается только при создании первого клиента для контекста
+            # Один ApiClient (и один пул соединений urllib3) на все API-объекты
+            cfg = copy.deepcopy(_kube_configuration(context or None))
+            cfg.connection_pool_maxsize = 32
+            # Повторы на уровне пула соединений: переиспользуют keep-alive соединение вместо переподключения
+            cfg.retries = Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                # Только идемпотентные запросы: POST (create) при повторе после 5xx может дать 409 или дубликат;
+                # PATCH отправляется только как server-side apply, который идемпотентен
+                allowed_methods=frozenset(["GET", "DELETE", "PUT", "PATCH"]),
+                # После исчерпания повторов клиент получает последний ответ и поднимает ApiException, а не MaxRetryError
+                raise_on_status=False,
+            )
+            self.api_client = _api_client_class()(configuration=cfg)
+            # Пулы соединений создаются лениво, поэтому опции сокета применятся ко всем соединениям клиента
+            self.api_client.rest_client.pool_manager.connection_pool_kw["socket_options"] = _keepalive_socket_options()
+            self.v1 = client.CoreV1Api(self.api_client)
+            self.apps_v1 = client.AppsV1Api(self.api_client)
+            # Связанные методы чтения строятся один раз, а не через getattr на каждую проверку
+            self._readers = {
+                resource_type: getattr(getattr(self, attr), method)
+                for resource_type, (attr, method) in RESOURCE_READERS.items()
+            }
+            # (тип ресурса, namespace, имя) -> (существует ли, время проверки)
+            self._exists_cache: Dict[Tuple[str, str, str], Tuple[bool, float]] = {}
+            # (namespace, нормализованный селектор меток) -> (имя запущенного пода, время поиска)
+            self._pod_name_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+            # Хранилища информеров: тип ресурса -> {(namespace, имя)}; тип появляется после первичной загрузки списка
+            self._stores: Dict[str, Set[Tuple[str, str]]] = {}
+            self._informer_namespace: Optional[str] = None
+            self._informer_stop = threading.Event()
+            self._informer_threads: List[threading.Thread] = []
             logger.info("Kubernetes клиент инициализирован успешно")
         except Exception as e:
-            logger.error(f"Ошибка при инициализации Kubernetes клиента: {e}")
+            logger.error("Ошибка при инициализации Kubernetes клиента: %s", e)
             raise
 
     def resource_exists(self, name: str, namespace: str = "default", resource_type: str = "deployment") -> bool:
@@ -36,26 +199,168 @@ class KubernetesOperations:
         Returns:
             bool: True если ресурс существует, False если нет
         """
+        reader = self._readers.get(resource_type)
+        if reader is None:
+            logger.warning("Неизвестный тип ресурса: %s", resource_type)
+            return False
+
+        # При запущенном информере ответ берется из локального хранилища, синхронизируемого через watch
+        store = self._stores.get(resource_type)
+        if store is not None and self._informer_namespace in (None, namespace):
+            return (namespace, name) in store
+
+        # Повторные проверки в пределах _EXISTS_TTL не обращаются к API-серверу
+        key = (resource_type, namespace, name)
+        cached = self._exists_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self._EXISTS_TTL:
+            return cached[0]
+
         try:
-            if resource_type == "deployment":
-                self.apps_v1.read_namespaced_deployment(name, namespace)
-            elif resource_type == "service":
-                self.v1.read_namespaced_service(name, namespace)
-            elif resource_type == "pod":
-                self.v1.read_namespaced_pod(name, namespace)
-            else:
-                logger.warning(f"Неизвестный тип ресурса: {resource_type}")
-                return False
+            from kubernetes import client
+
+            reader(name, namespace)
+            self._exists_cache[key] = (True, time.monotonic())
             return True
         except client.exceptions.ApiException as e:
             if e.status == 404:
+                self._exists_cache[key] = (False, time.monotonic())
                 return False
-            logger.error(f"API ошибка при проверке ресурса {resource_type}/{name}: {e}")
+            logger.error("API ошибка при проверке ресурса %s/%s: %s", resource_type, name, e)
             raise e
         except Exception as e:
-            logger.error(f"Ошибка при проверке ресурса {resource_type}/{name}: {e}")
+            logger.error("Ошибка при проверке ресурса %s/%s: %s", resource_type, name, e)
             return False
 
+    def start_informers(
+        self, resource_types=("deployment", "service"), namespace: Optional[str] = None, sync_timeout: float = 10
+    ) -> bool:
+        """
+        Запускает информеры: фоновые потоки, которые держат в памяти список ресурсов через list + watch
+
+        После синхронизации resource_exists для этих типов отвечает без запросов к API-серверу.
+        Ранее запущенные информеры останавливаются.
+
+        Args:
+            resource_types: Типы ресурсов ('deployment', 'service', 'pod')
+            namespace: Namespace для наблюдения (по умолчанию все namespace)
+            sync_timeout: Сколько секунд ждать первичной загрузки списков
+
+        Returns:
+            bool: True если все хранилища синхронизированы за sync_timeout
+        """
+        self._stop_informers()
+        # У каждого запуска свое событие остановки: потоки прежнего запуска не подхватят новый запуск
+        stop = threading.Event()
+        self._informer_stop = stop
+        self._informer_namespace = namespace
+        for resource_type in resource_types:
+            api_name, all_namespaces_method, namespaced_method = self._INFORMER_LISTS[resource_type]
+            api = getattr(self, api_name)
+            if namespace is None:
+                list_func, kwargs = getattr(api, all_namespaces_method), {}
+            else:
+                list_func, kwargs = getattr(api, namespaced_method), {"namespace": namespace}
+            thread = threading.Thread(
+                target=self._run_informer,
+                args=(resource_type, list_func, kwargs, stop),
+                name=f"informer-{resource_type}",
+                daemon=True,
+            )
+            self._informer_threads.append(thread)
+            thread.start()
+
+        deadline = time.monotonic() + sync_timeout
+        while time.monotonic() < deadline:
+            if all(resource_type in self._stores for resource_type in resource_types):
+                logger.info("Информеры синхронизированы: %s", ", ".join(resource_types))
+                return True
+            stop.wait(0.05)
+
+        logger.warning("Информеры не синхронизировались за %s сек", sync_timeout)
+        return False
+
+    def _stop_informers(self, join_timeout: float = 5):
+        """
+        Останавливает потоки информеров и ждет их завершения не дольше join_timeout секунд
+        """
+        self._informer_stop.set()
+        deadline = time.monotonic() + join_timeout
+        for thread in self._informer_threads:
+            thread.join(max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                # Поток заблокирован чтением watch: он завершится по таймауту watch и не тронет новые хранилища
+                logger.info(
+                    "Поток %s не завершился за %s сек, он завершится по таймауту watch", thread.name, join_timeout
+                )
+        self._informer_threads = []
+        self._stores.clear()
+
+    def _run_informer(self, resource_type: str, list_func, kwargs: dict, stop: threading.Event):
+        """
+        Цикл информера: загружает список ресурсов и поддерживает его актуальным по событиям watch
+        """
+        from kubernetes import client, watch
+
+        store = None
+        while not stop.is_set():
+            try:
+                resources = list_func(**kwargs)
+                # Остановка могла произойти во время загрузки списка: хранилище нового запуска не перезаписываем
+                if stop.is_set():
+                    break
+                store = {(item.metadata.namespace, item.metadata.name) for item in resources.items}
+                resource_version = resources.metadata.resource_version
+                self._stores[resource_type] = store
+
+                while not stop.is_set():
+                    # Хранилищу нужны только namespace и имя, поэтому объекты событий не превращаются в модели
+                    w = watch.Watch(return_type="object")
+                    for event in w.stream(list_func, resource_version=resource_version, timeout_seconds=60, **kwargs):
+                        if stop.is_set():
+                            w.stop()
+                            break
+                        metadata = event["object"]["metadata"]
+                        resource_version = metadata["resourceVersion"]
+                        if event["type"] == "DELETED":
+                            store.discard((metadata.get("namespace"), metadata["name"]))
+                        else:
+                            store.add((metadata.get("namespace"), metadata["name"]))
+            except client.exceptions.ApiException as e:
+                # 410 Gone: версия ресурсов устарела, заново загружаем список
+                if e.status == 410:
+                    logger.info("Версия ресурсов %s устарела, перезагружаем список", resource_type)
+                    continue
+                logger.warning("Ошибка информера %s: %s", resource_type, e)
+                self._drop_store(resource_type, store)
+                stop.wait(1)
+            except Exception as e:
+                logger.warning("Ошибка информера %s: %s", resource_type, e)
+                self._drop_store(resource_type, store)
+                stop.wait(1)
+
+        self._drop_store(resource_type, store)
+
+    def _drop_store(self, resource_type: str, store: Optional[Set[Tuple[str, str]]]):
+        """
+        Удаляет хранилище информера, только если оно не было заменено хранилищем другого запуска
+        """
+        if store is not None and self._stores.get(resource_type) is store:
+            self._stores.pop(resource_type, None)
+
+    def _remember_resource(self, name: str, namespace: str, resource_type: str, exists: bool):
+        """
+        Запоминает состояние ресурса после его изменения, чтобы следующая проверка не обращалась к API-серверу
+        """
+        self._exists_cache[(resource_type, namespace, name)] = (exists, time.monotonic())
+        # Событие watch может прийти позже, поэтому обновляем хранилище информера сразу
+        store = self._stores.get(resource_type)
+        if store is not None:
+            if exists:
+                store.add((namespace, name))
+            else:
+                store.discard((namespace, name))
+
+    @_safe_api("Ошибка при создании deployment из файла {yaml_file}")
     def create_deployment(self, yaml_file, wait_ready=False, timeout=60):
         """
         Создает deployment из yaml файла
@@ -68,99 +373,186 @@ class KubernetesOperations:
         Returns:
             Объект Deployment или None в случае ошибки
         """
-        try:
-            with open(yaml_file) as f:
-                dep = yaml.safe_load(f)
+        version = manifest_version(yaml_file)
+        dep = load_yaml(yaml_file, version)
 
-            name = dep["metadata"]["name"]
-            namespace = dep["metadata"].get("namespace", "default")
+        name = dep["metadata"]["name"]
+        namespace = dep["metadata"].get("namespace", "default")
 
-            # Проверяем существование deployment
-            if self.resource_exists(name, namespace, "deployment"):
-                logger.info(f"Deployment {name} уже существует, обновляем...")
-                resp = self.apps_v1.replace_namespaced_deployment(name=name, namespace=namespace, body=dep)
-            else:
-                logger.info(f"Создаем новый deployment {name}...")
-                resp = self.apps_v1.create_namespaced_deployment(body=dep, namespace=namespace)
+        logger.info("Применяем deployment %s...", name)
+        resp = self._server_side_apply(
+            "/apis/apps/v1/namespaces/{namespace}/deployments/{name}", name, namespace, dep, "V1Deployment"
+        )
 
-            logger.info(f"Deployment {resp.metadata.name} создан/обновлен")
+        self._remember_resource(name, namespace, "deployment", True)
+        logger.info("Deployment %s создан/обновлен", resp.metadata.name)
 
-            # Ожидаем готовности подов, если нужно
-            if wait_ready and "spec" in dep and "selector" in dep["spec"] and "matchLabels" in dep["spec"]["selector"]:
-                labels = dep["spec"]["selector"]["matchLabels"]
-                label_selector = ",".join([f"{k}={v}" for k, v in labels.items()])
-                if self.wait_for_pod_ready(label_selector, namespace, timeout):
-                    logger.info(f"Поды deployment {name} готовы")
-                else:
-                    logger.warning(f"Таймаут ожидания готовности подов deployment {name}")
+        # Ожидаем готовности подов, если нужно
+        label_selector = deployment_selector(yaml_file, version) if wait_ready else None
+        if label_selector:
+            if self.wait_for_pod_ready(label_selector, namespace, timeout, dep["spec"].get("replicas", 1)):
+                logger.info("Поды deployment %s готовы", name)
+            else:
+                logger.warning("Таймаут ожидания готовности подов deployment %s", name)
 
-            return resp
-        except Exception as e:
-            logger.error(f"Ошибка при создании deployment из файла {yaml_file}: {e}")
-            return None
+        return resp
 
+    @_safe_api("Ошибка при создании service из файла {yaml_file}")
     def create_service(self, yaml_file):
         """
         Создает service из yaml файла
         """
+        svc = load_yaml(yaml_file, manifest_version(yaml_file))
+
+        name = svc["metadata"]["name"]
+        namespace = svc["metadata"].get("namespace", "default")
+
+        logger.info("Применяем service %s...", name)
+        resp = self._server_side_apply(
+            "/api/v1/namespaces/{namespace}/services/{name}", name, namespace, svc, "V1Service"
+        )
+
+        self._remember_resource(name, namespace, "service", True)
+        logger.info("Service %s создан/обновлен", resp.metadata.name)
+        return resp
+
+    def _server_side_apply(self, resource_path: str, name: str, namespace: str, body: dict, response_type: str):
+        """
+        Создает или обновляет ресурс одним PATCH-запросом (server-side apply) без предварительного чтения
+
+        При конфликте владения полями (409) запрос повторяется с force=True.
+
+        Args:
+            resource_path: Шаблон пути ресурса в API
+            name: Имя ресурса
+            namespace: Namespace ресурса
+            body: Манифест ресурса
+            response_type: Тип модели ответа (например, 'V1Deployment')
+
+        Returns:
+            Объект ресурса из ответа API-сервера
+        """
+        from kubernetes import client
+
+        def _patch(force: bool):
+            # Генерированные patch_* методы этой версии клиента не позволяют выбрать application/apply-patch+yaml
+            return self.api_client.call_api(
+                resource_path,
+                "PATCH",
+                path_params={"name": name, "namespace": namespace},
+                query_params=[("fieldManager", self._FIELD_MANAGER)] + ([("force", True)] if force else []),
+                header_params={"Accept": "application/json", "Content-Type": "application/apply-patch+yaml"},
+                body=body,
+                response_type=response_type,
+                auth_settings=["BearerToken"],
+                _return_http_data_only=True,
+            )
+
         try:
-            with open(yaml_file) as f:
-                svc = yaml.safe_load(f)
+            return _patch(force=False)
+        except client.exceptions.ApiException as e:
+            if e.status != 409:
+                raise
+            logger.warning("Конфликт владения полями %s, повторяем apply с force", name)
+            return _patch(force=True)
 
-            name = svc["metadata"]["name"]
-            namespace = svc["metadata"].get("namespace", "default")
+    def create_resources(self, yaml_files: List[str]) -> list:
+        """
+        Параллельно создает ресурсы из нескольких yaml файлов
 
-            # Проверяем существование service
-            if self.resource_exists(name, namespace, "service"):
-                logger.info(f"Service {name} уже существует, обновляем...")
-                resp = self.v1.replace_namespaced_service(name=name, namespace=namespace, body=svc)
-            else:
-                logger.info(f"Создаем новый service {name}...")
-                resp = self.v1.create_namespaced_service(body=svc, namespace=namespace)
+        Тип ресурса определяется по полю kind (поддерживаются Deployment и Service).
+
+        Args:
+            yaml_files: Пути к YAML файлам
+
+        Returns:
+            list: Результаты create_deployment/create_service в порядке файлов (None в случае ошибки)
+        """
+        if not yaml_files:
+            return []
+
+        logger.info("Параллельное создание ресурсов из %s файлов", len(yaml_files))
+        with ThreadPoolExecutor(max_workers=min(len(yaml_files), 16)) as executor:
+            return list(executor.map(self._dispatch_manifest, yaml_files))
 
-            logger.info(f"Service {resp.metadata.name} создан/обновлен")
-            return resp
+    def _dispatch_manifest(self, yaml_file: str):
+        """
+        Создает ресурс из yaml файла с помощью метода, соответствующего его типу
+        """
+        try:
+            kind = load_yaml(yaml_file, manifest_version(yaml_file)).get("kind")
         except Exception as e:
-            logger.error(f"Ошибка при создании service из файла {yaml_file}: {e}")
+            logger.error("Ошибка при чтении файла %s: %s", yaml_file, e)
             return None
 
-    def delete_deployment(self, name, namespace="default"):
+        if kind == "Deployment":
+            return self.create_deployment(yaml_file)
+        if kind == "Service":
+            return self.create_service(yaml_file)
+
+        logger.warning("Неподдерживаемый тип ресурса %s в файле %s", kind, yaml_file)
+        return None
+
+    @_safe_api("Ошибка при удалении deployment {name}")
+    def delete_deployment(self, name, namespace="default", wait: bool = False):
         """
         Удаляет deployment по имени
+
+        Args:
+            name: Имя deployment
+            namespace: Namespace deployment
+            wait: Удалять с Foreground-распространением (deployment удаляется после зависимых подов).
+                По умолчанию используется Background: зависимые ресурсы удаляет сборщик мусора кластера
+
+        Returns:
+            Ответ API, True если deployment не существует, или None в случае ошибки
         """
-        try:
-            if not self.resource_exists(name, namespace, "deployment"):
-                logger.info(f"Deployment {name} не существует, пропускаем удаление")
-                return True
+        from kubernetes import client
 
+        # Удаляем сразу, без предварительной проверки существования: 404 означает, что удалять нечего
+        try:
             resp = self.apps_v1.delete_namespaced_deployment(
                 name=name,
                 namespace=namespace,
-                body=client.V1DeleteOptions(propagation_policy="Foreground", grace_period_seconds=5),
+                body=(
+                    client.V1DeleteOptions(propagation_policy="Foreground", grace_period_seconds=5)
+                    if wait
+                    else client.V1DeleteOptions(propagation_policy="Background", grace_period_seconds=0)
+                ),
             )
-            logger.info(f"Deployment {name} удален")
-            return resp
-        except Exception as e:
-            logger.error(f"Ошибка при удалении deployment {name}: {e}")
-            return None
+        except client.exceptions.ApiException as e:
+            if e.status != 404:
+                raise
+            self._remember_resource(name, namespace, "deployment", False)
+            logger.info("Deployment %s не существует, пропускаем удаление", name)
+            return True
+        self._remember_resource(name, namespace, "deployment", False)
+        self._pod_name_cache.clear()
+        logger.info("Deployment %s удален", name)
+        return resp
 
+    @_safe_api("Ошибка при удалении service {name}")
     def delete_service(self, name, namespace="default"):
         """
         Удаляет service по имени
         """
-        try:
-            if not self.resource_exists(name, namespace, "service"):
-                logger.info(f"Service {name} не существует, пропускаем удаление")
-                return True
+        from kubernetes import client
 
+        try:
             resp = self.v1.delete_namespaced_service(name=name, namespace=namespace)
-            logger.info(f"Service {name} удален")
-            return resp
-        except Exception as e:
-            logger.error(f"Ошибка при удалении service {name}: {e}")
-            return None
+        except client.exceptions.ApiException as e:
+            if e.status != 404:
+                raise
+            self._remember_resource(name, namespace, "service", False)
+            logger.info("Service %s не существует, пропускаем удаление", name)
+            return True
+        self._remember_resource(name, namespace, "service", False)
+        self._pod_name_cache.clear()
+        logger.info("Service %s удален", name)
+        return resp
 
-    def exec_command_in_pod(self, pod_name, namespace="default", command=None, timeout=30):
+    @_safe_api("Ошибка при выполнении команды в pod {pod_name}")
+    def exec_command_in_pod(self, pod_name, namespace="default", command=None, timeout=30, connect_timeout=10):
         """
         Выполняет команду внутри pod
 
@@ -168,36 +560,74 @@ class KubernetesOperations:
             pod_name: Имя пода
             namespace: Namespace пода
             command: Команда для выполнения в виде списка
-            timeout: Таймаут выполнения команды в секундах
+            timeout: Таймаут выполнения команды в секундах (число, а не кортеж (connect, read))
+            connect_timeout: Таймаут установки WebSocket-соединения в секундах
 
         Returns:
             str: Результат выполнения команды или None в случае ошибки
         """
         if command is None:
             command = ["/bin/sh"]
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)):
+            raise TypeError(f"timeout должен быть числом секунд, получено {timeout!r}")
+
+        logger.info("Выполняем команду %s в поде %s", command, pod_name)
+        # Существование пода не проверяется отдельным запросом: для отсутствующего пода
+        # API-сервер отклоняет WebSocket-подключение, и ошибка логируется декоратором
+        ws = self._connect_exec(pod_name, namespace, command, stdin=False, connect_timeout=connect_timeout)
+        # Ожидание вывода ограничиваем сами и закрываем соединение в любом случае, в том числе по таймауту
+        try:
+            ws.run_forever(timeout=float(timeout))
+            if ws.is_open():
+                logger.warning("Команда %s в поде %s не завершилась за %s сек", command, pod_name, timeout)
+            return ws.read_all()
+        finally:
+            ws.close()
+
+    def _connect_exec(self, pod_name: str, namespace: str, command: List[str], stdin: bool, connect_timeout: float):
+        """
+        Открывает exec WebSocket-соединение с подом, ограничивая время подключения
+
+        stream() не передает таймаут в websocket-client, поэтому подключение выполняется в фоновом daemon-потоке,
+        а его ожидание ограничено connect_timeout. Зависшее подключение не задерживает завершение процесса,
+        а соединение, установленное после таймаута, закрывается.
 
+        Returns:
+            WSClient открытого соединения
+
+        Raises:
+            TimeoutError: если соединение не установлено за connect_timeout
+        """
+        from kubernetes.stream import stream
+
+        future = Future()
+
+        def _connect():
+            try:
+                future.set_result(
+                    stream(
+                        self.v1.connect_get_namespaced_pod_exec,
+                        pod_name,
+                        namespace,
+                        command=command,
+                        stderr=True,
+                        stdin=stdin,
+                        stdout=True,
+                        tty=False,
+                        _preload_content=False,
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_connect, name=f"k8s-exec-connect-{pod_name}", daemon=True).start()
         try:
-            if not self.resource_exists(pod_name, namespace, "pod"):
-                logger.error(f"Под {pod_name} не существует")
-                return None
-
-            logger.info(f"Выполняем команду {command} в поде {pod_name}")
-            resp = stream(
-                self.v1.connect_get_namespaced_pod_exec,
-                pod_name,
-                namespace,
-                command=command,
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=False,
-                _request_timeout=timeout,
-            )
-            return resp
-        except Exception as e:
-            logger.error(f"Ошибка при выполнении команды в pod {pod_name}: {e}")
-            return None
+            return future.result(timeout=connect_timeout)
+        except FutureTimeoutError:
+            future.add_done_callback(_close_late_connection)
+            raise TimeoutError(f"Соединение с подом {pod_name} не установлено за {connect_timeout} сек")
 
+    @_safe_api("Ошибка при создании NodePort service {service_name}")
     def expose_service_nodeport(
         self, service_name, selector=None, namespace="default", port=80, target_port=80, node_port=30000
     ):
@@ -215,35 +645,36 @@ class KubernetesOperations:
         Returns:
             Объект Service или None в случае ошибки
         """
+        from kubernetes import client
+
+        # Если селектор не указан, используем имя сервиса как метку app
+        if selector is None:
+            selector = {"app": service_name}
+
+        service_manifest = dict(
+            NODEPORT_SERVICE_TEMPLATE,
+            metadata={"name": service_name},
+            spec={
+                "type": "NodePort",
+                "ports": [{"port": port, "targetPort": target_port, "nodePort": node_port}],
+                "selector": selector,
+            },
+        )
+
+        logger.info("Создаем NodePort service %s на порту %s", service_name, node_port)
+        # Сразу пробуем создать сервис; если он уже существует (409), обновляем его одним запросом
         try:
-            # Если сервис уже существует, удаляем его
-            if self.resource_exists(service_name, namespace, "service"):
-                logger.info(f"Service {service_name} уже существует, удаляем...")
-                self.delete_service(service_name, namespace)
-
-            # Если селектор не указан, используем имя сервиса как метку app
-            if selector is None:
-                selector = {"app": service_name}
-
-            service_manifest = {
-                "apiVersion": "v1",
-                "kind": "Service",
-                "metadata": {"name": service_name},
-                "spec": {
-                    "type": "NodePort",
-                    "ports": [{"port": port, "targetPort": target_port, "nodePort": node_port}],
-                    "selector": selector,
-                },
-            }
-
-            logger.info(f"Создаем NodePort service {service_name} на порту {node_port}")
             resp = self.v1.create_namespaced_service(namespace=namespace, body=service_manifest)
-            logger.info(f"NodePort Service {service_name} создан на порту {node_port}")
-            return resp
-        except Exception as e:
-            logger.error(f"Ошибка при создании NodePort service {service_name}: {e}")
-            return None
-
+        except client.exceptions.ApiException as e:
+            if e.status != 409:
+                raise
+            logger.info("Service %s уже существует, обновляем...", service_name)
+            resp = self.v1.replace_namespaced_service(name=service_name, namespace=namespace, body=service_manifest)
+        self._remember_resource(service_name, namespace, "service", True)
+        logger.info("NodePort Service %s создан на порту %s", service_name, node_port)
+        return resp
+
+    @_safe_api("Ошибка при поиске пода по метке {label_selector}")
     def get_pod_name_by_label(self, label_selector: str, namespace: str = "default") -> str:
         """
         Получает имя пода по метке
@@ -255,78 +686,190 @@ class KubernetesOperations:
         Returns:
             str: Имя пода или None, если под не найден
         """
-        try:
-            logger.info(f"Поиск пода по метке {label_selector} в namespace {namespace}")
-            pods = self.v1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
-
-            if pods.items:
-                # Берем первый запущенный под
-                for pod in pods.items:
-                    if pod.status.phase == "Running":
-                        logger.info(f"Найден запущенный под {pod.metadata.name}")
-                        return pod.metadata.name
-
-                # Если нет запущенных, берем первый под
-                logger.warning(
-                    f"Запущенные поды не найдены, используем первый доступный: {pods.items[0].metadata.name}"
-                )
-                return pods.items[0].metadata.name
+        # Повторные поиски по той же метке в пределах _POD_NAME_TTL не обращаются к API-серверу
+        cache_key = (namespace, normalize_selector(label_selector))
+        cached = self._pod_name_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[1] < self._POD_NAME_TTL:
+            return cached[0]
+
+        logger.info("Поиск пода по метке %s в namespace %s", label_selector, namespace)
+        # Фильтрация на стороне API-сервера: нужен только один запущенный под, а не весь список
+        pods = self.v1.list_namespaced_pod(
+            namespace=namespace,
+            label_selector=label_selector,
+            field_selector="status.phase=Running",
+            limit=1,
+            _request_timeout=5,
+        )
+        if pods.items:
+            logger.info("Найден запущенный под %s", pods.items[0].metadata.name)
+            self._pod_name_cache[cache_key] = (pods.items[0].metadata.name, time.monotonic())
+            return pods.items[0].metadata.name
+
+        pods = self.v1.list_namespaced_pod(
+            namespace=namespace, label_selector=label_selector, limit=1, _request_timeout=5
+        )
+        if pods.items:
+            # Если нет запущенных, берем первый под
+            logger.warning("Запущенные поды не найдены, используем первый доступный: %s", pods.items[0].metadata.name)
+            return pods.items[0].metadata.name
+
+        logger.warning("Под с меткой %s не найден", label_selector)
+        return None
+
+    @_safe_api("Ошибка при получении списка подов по метке {label_selector}")
+    def list_pods(self, label_selector: str, namespaces: Optional[List[str]] = None) -> list:
+        """
+        Получает поды по метке сразу во всех нужных namespace одним запросом
 
-            logger.warning(f"Под с меткой {label_selector} не найден")
-            return None
-        except Exception as e:
-            logger.error(f"Ошибка при поиске пода по метке {label_selector}: {e}")
-            return None
+        Args:
+            label_selector: Селектор меток (например, "app=kafka")
+            namespaces: Namespace, в которых искать поды (по умолчанию все)
 
-    def wait_for_pod_ready(self, label_selector: str, namespace: str = "default", timeout: int = 60) -> bool:
+        Returns:
+            list: Объекты Pod или None в случае ошибки
+        """
+        # Для одного namespace достаточно обычного запроса (и прав только на этот namespace)
+        if namespaces is not None and len(namespaces) == 1:
+            return self.v1.list_namespaced_pod(namespace=namespaces[0], label_selector=label_selector).items
+
+        pods = self.v1.list_pod_for_all_namespaces(label_selector=label_selector).items
+        if namespaces is None:
+            return pods
+        wanted = set(namespaces)
+        return [pod for pod in pods if pod.metadata.namespace in wanted]
+
+    @_safe_api("Ошибка при ожидании готовности пода с меткой {label_selector}", default=False)
+    def wait_for_pod_ready(
+        self, label_selector: str, namespace: str = "default", timeout: int = 60, expected_pods: Optional[int] = None
+    ) -> bool:
         """
         Ожидает готовности пода
 
+        Вместо периодического опроса списка подов использует Watch API:
+        события об изменении подов приходят по одному HTTP-потоку сразу после изменения.
+
         Args:
             label_selector: Селектор меток (например, "app=kafka-ui")
             namespace: Namespace пода
             timeout: Таймаут в секундах
+            expected_pods: Ожидаемое число подов (например, spec.replicas deployment); если не указано,
+                достаточно готовности всех уже появившихся подов
 
         Returns:
             bool: True если под готов, False в случае ошибки или таймаута
         """
-        try:
-            logger.info(f"Ожидание готовности пода с меткой {label_selector}, таймаут {timeout} сек")
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                pods = self.v1.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
-
-                if not pods.items:
-                    logger.warning(f"Поды с меткой {label_selector} не найдены, ожидаем...")
-                    time.sleep(2)
-                    continue
-
-                # Проверяем статус подов
-                ready_pods = 0
-                total_pods = len(pods.items)
-
-                for pod in pods.items:
-                    if pod.status.phase == "Running":
-                        # Проверяем, что все контейнеры готовы
-                        if pod.status.container_statuses and all(
-                            container.ready for container in pod.status.container_statuses
-                        ):
-                            ready_pods += 1
-
-                logger.info(f"Готово {ready_pods}/{total_pods} подов")
-
-                if ready_pods == total_pods and total_pods > 0:
-                    logger.info(f"Все поды готовы ({total_pods})")
-                    return True
+        from kubernetes import client, watch
+
+        logger.info("Ожидание готовности пода с меткой %s, таймаут %s сек", label_selector, timeout)
+        deadline = time.monotonic() + timeout
+        resource_version = None
+        # Наблюдаемые и готовые поды по uid (имя может повториться у пересозданного пода);
+        # множества позволяют пересчитывать готовность за O(1) на событие
+        pods_seen = set()
+        pods_ready = set()
+        required_pods = expected_pods or 1
+        # Последнее залогированное состояние (готово, всего): прогресс пишется в лог только при его изменении
+        last_logged = None
+
+        while time.monotonic() < deadline:
+            # Событие содержит под в виде словаря: полная модель V1Pod со спецификацией не строится
+            w = watch.Watch(return_type="object")
+            try:
+                for event in w.stream(
+                    self.v1.list_namespaced_pod,
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, int(deadline - time.monotonic())),
+                ):
+                    pod = event["object"]
+                    resource_version = pod["metadata"]["resourceVersion"]
+
+                    if event["type"] == "DELETED":
+                        pods_seen.discard(pod["metadata"]["uid"])
+                        pods_ready.discard(pod["metadata"]["uid"])
+                        continue
+                    pods_seen.add(pod["metadata"]["uid"])
+                    if is_pod_ready(pod):
+                        pods_ready.add(pod["metadata"]["uid"])
+                    else:
+                        pods_ready.discard(pod["metadata"]["uid"])
+
+                    ready_pods = len(pods_ready)
+                    total_pods = len(pods_seen)
+                    if (ready_pods, total_pods) != last_logged:
+                        last_logged = (ready_pods, total_pods)
+                        logger.info("Готово %s/%s подов", ready_pods, total_pods)
+
+                    if ready_pods == total_pods and total_pods >= required_pods:
+                        logger.info("Все поды готовы (%s)", total_pods)
+                        w.stop()
+                        return True
+            except client.exceptions.ApiException as e:
+                # 410 Gone: версия ресурсов устарела, перезапускаем watch с полного списка
+                if e.status != 410:
+                    raise
+                logger.warning("Версия ресурсов устарела, перезапускаем watch подов")
+                resource_version = None
+                pods_seen.clear()
+                pods_ready.clear()
+
+        logger.warning("Таймаут ожидания готовности пода (%s сек)", timeout)
+        return False
+
+    @_safe_api("Ошибка при ожидании пода по метке {label_selector}")
+    def _wait_and_get_ready_pod(
+        self, label_selector: str, namespace: str = "default", timeout: int = 60
+    ) -> Optional[str]:
+        """
+        Ожидает первый готовый под по метке и возвращает его имя
 
-                time.sleep(2)
+        Один watch-поток заменяет ожидание готовности и отдельный запрос списка подов.
 
-            logger.warning(f"Таймаут ожидания готовности пода ({timeout} сек)")
-            return False
-        except Exception as e:
-            logger.error(f"Ошибка при ожидании готовности пода: {e}")
-            return False
+        Args:
+            label_selector: Селектор меток (например, "app=kafka")
+            namespace: Namespace пода
+            timeout: Таймаут в секундах
 
+        Returns:
+            str: Имя готового пода или None в случае ошибки или таймаута
+        """
+        from kubernetes import client, watch
+
+        logger.info("Ожидание готового пода с меткой %s, таймаут %s сек", label_selector, timeout)
+        deadline = time.monotonic() + timeout
+        resource_version = None
+
+        while time.monotonic() < deadline:
+            # Событие содержит под в виде словаря: полная модель V1Pod со спецификацией не строится
+            w = watch.Watch(return_type="object")
+            try:
+                for event in w.stream(
+                    self.v1.list_namespaced_pod,
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=max(1, int(deadline - time.monotonic())),
+                ):
+                    pod = event["object"]
+                    resource_version = pod["metadata"]["resourceVersion"]
+
+                    if event["type"] != "DELETED" and is_pod_ready(pod):
+                        logger.info("Найден готовый под %s", pod["metadata"]["name"])
+                        w.stop()
+                        return pod["metadata"]["name"]
+            except client.exceptions.ApiException as e:
+                # 410 Gone: версия ресурсов устарела, перезапускаем watch с полного списка
+                if e.status != 410:
+                    raise
+                logger.warning("Версия ресурсов устарела, перезапускаем watch подов")
+                resource_version = None
+
+        logger.warning("Готовый под с меткой %s не найден за %s сек", label_selector, timeout)
+        return None
+
+    @_safe_api("Ошибка при ожидании готовности Kafka (под {pod_name}, метка {label_selector})", default=False)
     def wait_for_kafka_ready(self, pod_name=None, label_selector=None, namespace="default", timeout=120):
         """
         Ожидает готовности Kafka в поде Kubernetes
@@ -340,91 +883,130 @@ class KubernetesOperations:
         Returns:
             bool: True если Kafka готова, False в случае ошибки или таймаута
         """
-        try:
-            # Получаем имя пода, если указан label_selector
-            if pod_name is None and label_selector is not None:
-                logger.info(f"Поиск пода Kafka по метке {label_selector}")
-                pod_name = self.get_pod_name_by_label(label_selector, namespace)
-                if pod_name is None:
-                    logger.error(f"Не удалось найти под Kafka по метке {label_selector}")
-                    return False
-            elif pod_name is None:
-                logger.error("Необходимо указать pod_name или label_selector")
+        # Общий дедлайн для поиска пода и проверок Kafka, чтобы не превышать таймаут вызывающего кода
+        deadline = time.monotonic() + timeout
+        # Получаем имя пода, если указан label_selector: ждем первый готовый под одним watch-потоком
+        if pod_name is None and label_selector is not None:
+            logger.info("Поиск пода Kafka по метке %s", label_selector)
+            pod_name = self._wait_and_get_ready_pod(label_selector, namespace, max(0, deadline - time.monotonic()))
+            if pod_name is None:
+                logger.error("Не удалось найти под Kafka по метке %s", label_selector)
                 return False
+        elif pod_name is None:
+            logger.error("Необходимо указать pod_name или label_selector")
+            return False
+        # Под, найденный по метке, уже проверен watch-потоком
+        elif not self.resource_exists(pod_name, namespace, "pod"):
+            logger.error("Под %s не существует", pod_name)
+            return False
 
-            logger.info(f"Ожидание готовности Kafka в поде {pod_name}, таймаут {timeout} сек")
-
-            # Ожидаем готовности пода
-            if not self.resource_exists(pod_name, namespace, "pod"):
-                logger.error(f"Под {pod_name} не существует")
-                return False
+        logger.info("Ожидание готовности Kafka в поде %s, таймаут %s сек", pod_name, timeout)
 
-            # Проверяем статус Kafka с помощью команд
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                # Проверка через kafka-topics
-                result = self.exec_command_in_pod(
-                    pod_name=pod_name,
-                    namespace=namespace,
-                    command=[
-                        "/bin/sh",
-                        "-c",
-                        "kafka-topics.sh --list --bootstrap-server localhost:9092 2>/dev/null || kafka-topics --list --bootstrap-server localhost:9092 2>/dev/null",
-                    ],
-                    timeout=10,
+        # Все попытки выполняются в одной shell-сессии: exec-соединение открывается один раз,
+        # а не на каждую проверку; при обрыве сессия открывается заново
+        delay = 0.25
+        shell = None
+        try:
+            while time.monotonic() < deadline:
+                if shell is None or not shell.is_open():
+                    shell = self._open_shell(pod_name, namespace)
+                result = None
+                if shell is not None:
+                    result = self._run_in_shell(shell, KAFKA_PROBE_SCRIPT, timeout=min(10, deadline - time.monotonic()))
+                    if result is None:
+                        # Вывод мог прийти не полностью: остаток нельзя смешивать со следующей попыткой
+                        shell.close()
+                        shell = None
+                if result is not None:
+                    for tag, description in KAFKA_READY_TAGS:
+                        if tag in result:
+                            logger.info("Kafka в поде %s готова (%s)", pod_name, description)
+                            return True
+
+                # Ждем перед следующей попыткой с экспоненциальной задержкой и разбросом, не выходя за таймаут
+                time.sleep(max(0, min(delay + random.uniform(0, delay * 0.2), deadline - time.monotonic())))
+                delay = min(delay * 1.5, 2.0)
+                logger.info(
+                    "Ожидание Kafka в поде %s... прошло %s сек из %s",
+                    pod_name,
+                    int(timeout - (deadline - time.monotonic())),
+                    timeout,
                 )
+        finally:
+            if shell is not None:
+                shell.close()
 
-                if result is not None and not "Error" in result:
-                    logger.info(f"Kafka в поде {pod_name} готова (по проверке команды)")
-                    return True
+        logger.warning("Таймаут ожидания готовности Kafka в поде %s (%s сек)", pod_name, timeout)
+        return False
 
-                # Альтернативная проверка через kafka-broker-api-versions
-                result = self.exec_command_in_pod(
-                    pod_name=pod_name,
-                    namespace=namespace,
-                    command=[
-                        "/bin/sh",
-                        "-c",
-                        "kafka-broker-api-versions.sh --bootstrap-server localhost:9092 2>/dev/null || kafka-broker-api-versions --bootstrap-server localhost:9092 2>/dev/null",
-                    ],
-                    timeout=10,
-                )
+    def _open_shell(self, pod_name: str, namespace: str, connect_timeout: float = 10):
+        """
+        Открывает интерактивную shell-сессию (/bin/sh) в поде
 
-                if result is not None and "Supported" in result:
-                    logger.info(f"Kafka в поде {pod_name} готова (по проверке API версий)")
-                    return True
+        Args:
+            pod_name: Имя пода
+            namespace: Namespace пода
+            connect_timeout: Таймаут установки WebSocket-соединения в секундах
 
-                # Проверка через grep логов (если доступен)
-                result = self.exec_command_in_pod(
-                    pod_name=pod_name,
-                    namespace=namespace,
-                    command=[
-                        "/bin/sh",
-                        "-c",
-                        "grep 'started (kafka.server.KafkaServer)' /var/log/kafka/server.log 2>/dev/null || grep 'started (kafka.server.KafkaServer)' /logs/server.log 2>/dev/null",
-                    ],
-                    timeout=10,
-                )
+        Returns:
+            WSClient открытой сессии или None в случае ошибки
+        """
+        try:
+            return self._connect_exec(pod_name, namespace, ["/bin/sh"], stdin=True, connect_timeout=connect_timeout)
+        except Exception as e:
+            logger.warning("Не удалось открыть shell-сессию в поде %s: %s", pod_name, e)
+            return None
 
-                if result is not None and "started" in result:
-                    logger.info(f"Kafka в поде {pod_name} готова (по логам)")
-                    return True
+    @staticmethod
+    def _run_in_shell(shell, script: str, timeout: float) -> Optional[str]:
+        """
+        Выполняет скрипт в открытой shell-сессии и возвращает его stdout
 
-                # Ждем перед следующей попыткой
-                time.sleep(5)
-                logger.info(
-                    f"Ожидание Kafka в поде {pod_name}... прошло {int(time.time() - start_time)} сек из {timeout}"
-                )
+        Args:
+            shell: WSClient, открытый _open_shell
+            script: Команда или скрипт для /bin/sh
+            timeout: Таймаут ожидания вывода в секундах
 
-            logger.warning(f"Таймаут ожидания готовности Kafka в поде {pod_name} ({timeout} сек)")
-            return False
+        Returns:
+            str: Вывод скрипта или None, если сессия закрылась, оборвалась или вывод не завершился за timeout
+        """
+        from websocket import WebSocketException
+
+        deadline = time.monotonic() + timeout
+        output = ""
+        try:
+            shell.write_stdin(f"{{ {script}; }} 2>/dev/null; echo {_SHELL_DONE}\n")
+            while shell.is_open():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                output += shell.read_stdout(timeout=remaining)
+                if _SHELL_DONE in output:
+                    return output.split(_SHELL_DONE, 1)[0]
+        except (OSError, WebSocketException) as e:
+            # Обрыв соединения: вызывающий код закроет сессию и откроет новую
+            logger.warning("Shell-сессия оборвалась: %s", e)
+        return None
+
+    def close(self):
+        """
+        Закрывает общий ApiClient и соединения его пула
+
+        После закрытия клиент остается рабочим: новые запросы откроют соединения заново.
+        """
+        try:
+            self.api_client.close()
+            self.api_client.rest_client.pool_manager.clear()
         except Exception as e:
-            logger.error(f"Ошибка при ожидании готовности Kafka в поде {pod_name}: {e}")
-            return False
+            logger.error("Ошибка при закрытии Kubernetes клиента: %s", e)
 
     def cleanup(self):
         """
         Очищает ресурсы
         """
+        # Потоки информеров завершаются на ближайшем событии или по таймауту watch; ждем их ограниченное время
+        self._stop_informers()
+        self._pod_name_cache.clear()
+        self.close()
         logger.info("Очистка ресурсов Kubernetes завершена")
         # Место для дополнительной логики очистки ресурсов, если потребуется
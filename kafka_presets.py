@@ -0,0 +1,61 @@
+from container_operations import ContainerOperations
+from typing import TYPE_CHECKING, Optional, Tuple
+import types
+
+if TYPE_CHECKING:
+    from testcontainers.core.container import DockerContainer
+
+KAFKA_IMAGE = "confluentinc/cp-kafka:latest"
+ZOOKEEPER_IMAGE = "confluentinc/cp-zookeeper:latest"
+
+KAFKA_CONTAINER_NAME = "kafka-container"
+ZOOKEEPER_CONTAINER_NAME = "zookeeper"
+
+# Неизменяемые шаблоны окружения, собираются один раз при импорте
+KAFKA_ENV_TEMPLATE = types.MappingProxyType(
+    {
+        "KAFKA_ADVERTISED_LISTENERS": "PLAINTEXT://localhost:9092,PLAINTEXT_HOST://localhost:9093",
+        "KAFKA_LISTENER_SECURITY_PROTOCOL_MAP": "PLAINTEXT:PLAINTEXT,PLAINTEXT_HOST:PLAINTEXT",
+        "KAFKA_INTER_BROKER_LISTENER_NAME": "PLAINTEXT",
+        "KAFKA_BROKER_ID": "1",
+        "KAFKA_OFFSETS_TOPIC_REPLICATION_FACTOR": "1",
+        "KAFKA_GROUP_INITIAL_REBALANCE_DELAY_MS": "0",
+        "KAFKA_TRANSACTION_STATE_LOG_MIN_ISR": "1",
+        "KAFKA_TRANSACTION_STATE_LOG_REPLICATION_FACTOR": "1",
+        "KAFKA_ZOOKEEPER_CONNECT": f"{ZOOKEEPER_CONTAINER_NAME}:2181",
+    }
+)
+
+ZK_ENV_TEMPLATE = types.MappingProxyType({"ZOOKEEPER_CLIENT_PORT": "2181", "ZOOKEEPER_TICK_TIME": "2000"})
+
+
+def start_kafka_stack(
+    containers: ContainerOperations, broker_id: int = 1
+) -> Tuple[Optional["DockerContainer"], Optional["DockerContainer"]]:
+    """
+    Параллельно запускает Zookeeper и Kafka
+
+    Args:
+        containers: Экземпляр ContainerOperations
+        broker_id: Идентификатор брокера Kafka
+
+    Returns:
+        tuple: (контейнер Kafka, контейнер Zookeeper), None для контейнеров, которые не удалось запустить
+    """
+    started = containers.start_containers(
+        [
+            {
+                "name": ZOOKEEPER_CONTAINER_NAME,
+                "image": ZOOKEEPER_IMAGE,
+                "ports": {2181: 2181},
+                "environment": ZK_ENV_TEMPLATE,
+            },
+            {
+                "name": KAFKA_CONTAINER_NAME,
+                "image": KAFKA_IMAGE,
+                "ports": {9092: 9092, 9093: 9093},
+                "environment": dict(KAFKA_ENV_TEMPLATE, KAFKA_BROKER_ID=str(broker_id)),
+            },
+        ]
+    )
+    return started[KAFKA_CONTAINER_NAME], started[ZOOKEEPER_CONTAINER_NAME]